@@ -9,7 +9,11 @@ import streamlit as st
 import pandas as pd
 import plotly.express as px
 import plotly.graph_objects as go
-from utils import run_query, get_table_preview
+from utils import (
+    run_query, run_query_arrow, get_table_preview, split_metric, job_filter_params,
+    load_lookup_options, load_company_options, load_skill_options,
+    FILTERED_OVERVIEW_SQL, GOLD_OVERVIEW_SQL, SKILL_HEATMAP_SQL
+)
 import requests
 
 # Set up the Streamlit page configuration
@@ -37,17 +41,17 @@ TABLE_DISPLAY_NAMES = {
 }
 # Reverse mapping for lookup
 DISPLAY_TO_TABLE = {v: k for k, v in TABLE_DISPLAY_NAMES.items()}
+# Columns shown in the preview of wide tables (other tables show all columns)
+PREVIEW_COLUMNS = {
+    "job_postings": ['title', 'date_posted', 'company', 'country', 'cluster_name', 'avg_salary_annual_usd'],
+}
 
 # --- FILTERS ---
-# Load filter options (from previous queries)
-skill_options = [
-    'Power BI','airflow','alteryx','assembly','atlassian','aurora','aws','azure','bash','bigquery','bitbucket','c','clojure','cognos','crystal','css','dart','dax','delphi','docker','dplyr','excel','gcp','gdpr','git','github','gitlab','go','golang','graphql','hadoop','html','java','javascript','jira','js','julia','jupyter','keras','kotlin','linux','looker','matlab','matplotlib','microstrategy','mongodb','mssql','mxnet','mysql','nltk','no-sql','node','node.js','nosql','numpy','opencv','outlook','pandas','perl','php','pl/sql','plotly','postgres','postgresql','powerpoint','powershell','pyspark','python','pytorch','qlik','r','redis','redshift','ruby','rust','sap','sas','scala','scikit-learn','seaborn','selenium','sharepoint','shell','snowflake','spark','splunk','spreadsheet','spreadsheets','spss','sql','ssis','ssrs','swift','t-sql','tableau','tensorflow','terminal','typescript','unix','unix/linux','vb.net','vba','visio','word'
-]
-# Dynamically load company options from the database
-company_df = run_query('SELECT DISTINCT company FROM companies ORDER BY company')
-company_options = company_df['company'].dropna().astype(str).tolist()
-work_type_options = ["Hybrid", "Not Specified", "On-site", "Remote"]
-employment_type_options = ["Contract", "Full-time", "Internship", "Not Specified", "Part-time", "Temporary"]
+# Load filter options from the ETL's lookup tables (cached for a day)
+skill_options = load_skill_options()
+company_options = load_company_options()
+work_type_options = load_lookup_options("work_type")
+employment_type_options = load_lookup_options("employment_type")
 
 # Add a "All" option to each filter
 st.sidebar.markdown("---")
@@ -62,7 +66,7 @@ table_display = st.sidebar.selectbox(
     "Select a gold-layer table to preview:", list(TABLE_DISPLAY_NAMES.values())
 )
 table = DISPLAY_TO_TABLE[table_display]
-preview = get_table_preview(table, n=10)
+preview = get_table_preview(table, columns=PREVIEW_COLUMNS.get(table), n=10)
 # Rename columns for preview
 preview = preview.rename(columns={
     'date_posted': 'Date Posted',
@@ -105,38 +109,45 @@ tab1, tab2, tab3, tab4 = st.tabs([
     "Job Market Overview", "Skills & Demand", "Salary Insights", "Geography & Companies"
 ])
 
-# Filter the job_postings table based on selections
-filtered_job_postings = run_query(
-    f"""
-    SELECT * FROM job_postings
-    WHERE
-        ('{selected_skill}' = 'All' OR cluster_name LIKE '%{selected_skill}%') AND
-        ('{selected_company}' = 'All' OR company = '{selected_company}') AND
-        ('{selected_work_type}' = 'All' OR work_type = '{selected_work_type}') AND
-        ('{selected_employment_type}' = 'All' OR employment_type = '{selected_employment_type}')
-    """
-)
+# Overview aggregates in a single round-trip: precomputed gold tables when no
+# filter is active, otherwise computed on the fly from job_postings
+filter_params = job_filter_params(selected_skill, selected_company, selected_work_type, selected_employment_type)
+if any(value != "All" for value in filter_params):
+    overview = run_query(FILTERED_OVERVIEW_SQL, params=filter_params)
+else:
+    overview = run_query(GOLD_OVERVIEW_SQL)
+# Unfiltered aggregates used by the salary and geography tabs
+job_aggregates = run_query("""
+    SELECT 'archetype_salary' AS metric, cluster_name, ROUND(avg_salary, 0) AS avg_salary
+    FROM archetype_job_counts
+    UNION ALL BY NAME
+    SELECT 'salary_trend' AS metric, date_posted, avg_salary
+    FROM date_job_counts WHERE avg_salary IS NOT NULL
+    UNION ALL BY NAME
+    SELECT 'country' AS metric, country, iso3, job_count
+    FROM country_job_counts
+""")
 
 with tab1:
     st.subheader("Job Market Overview")
-    total_jobs = len(filtered_job_postings)
-    archetype_counts = filtered_job_postings.groupby('cluster_name').size().reset_index(name='Job Count')
-    archetype_counts = archetype_counts.rename(columns={'cluster_name': 'Job Archetype'})
-    archetype_counts = archetype_counts.sort_values(by="Job Count", ascending=False)
-    st.metric("Total Job Postings", total_jobs)
+    total_jobs = split_metric(overview, 'total', ['job_count'])['job_count'][0]
+    archetype_counts = split_metric(overview, 'archetype', ['cluster_name', 'job_count']).rename(
+        columns={'cluster_name': 'Job Archetype', 'job_count': 'Job Count'}
+    ).sort_values(by="Job Count", ascending=False)
+    st.metric("Total Job Postings", int(total_jobs))
     st.bar_chart(archetype_counts.set_index('Job Archetype'))
-    date_counts = filtered_job_postings.groupby('date_posted').size().reset_index(name='Job Count')
-    date_counts = date_counts.rename(columns={'date_posted': 'Date Posted'})
+    time_trend = split_metric(overview, 'date', ['date_posted', 'job_count']).rename(
+        columns={'job_count': 'Job Count'}
+    )
+    time_trend['date_posted'] = pd.to_datetime(time_trend['date_posted'])
+    time_trend = time_trend.sort_values('date_posted')
+    date_counts = time_trend.rename(columns={'date_posted': 'Date Posted'})
     date_counts = date_counts.sort_values(by="Date Posted", ascending=False).head(30)
     # Format 'Date Posted' to show only date (no time)
-    if 'Date Posted' in date_counts.columns:
-        date_counts['Date Posted'] = pd.to_datetime(date_counts['Date Posted']).dt.date
+    date_counts['Date Posted'] = date_counts['Date Posted'].dt.date
     st.dataframe(date_counts)
     # --- Time Trend Visualization ---
     st.markdown("#### 📈 Job Postings Over Time")
-    time_trend = filtered_job_postings.groupby('date_posted').size().reset_index(name='Job Count')
-    time_trend['date_posted'] = pd.to_datetime(time_trend['date_posted'])
-    time_trend = time_trend.sort_values('date_posted')
     fig_time = px.line(
         time_trend, x='date_posted', y='Job Count',
         title='Job Postings Trend Over Time',
@@ -166,20 +177,13 @@ with tab2:
         margin=dict(l=40, r=20, t=40, b=100),
     )
     st.plotly_chart(fig_skills, use_container_width=True)
-    us_skills = run_query("SELECT skill AS 'Skill', count AS 'Job Count' FROM country_skill_counts WHERE country='United States' ORDER BY count DESC LIMIT 10")
+    us_skills = run_query_arrow("SELECT skill AS 'Skill', count AS 'Job Count' FROM country_skill_counts WHERE country='United States' ORDER BY count DESC LIMIT 10")
     st.dataframe(us_skills)
     # --- Improved Heatmap: Skill vs. Country ---
     st.markdown("#### 🌎 Skill Demand Heatmap by Country")
-    heatmap_data = run_query("SELECT country, skill, count FROM country_skill_counts WHERE count > 0")
-    # Limit to top 10 countries and top 15 skills by total job count
-    top_countries = heatmap_data.groupby('country')['count'].sum().nlargest(10).index.tolist()
-    top_skills_heat = heatmap_data.groupby('skill')['count'].sum().nlargest(15).index.tolist()
-    filtered_heatmap = heatmap_data[
-        heatmap_data['country'].isin(top_countries) & heatmap_data['skill'].isin(top_skills_heat)
-    ]
-    pivot_heatmap = filtered_heatmap.pivot_table(index='country', columns='skill', values='count', fill_value=0)
-    # Sort axes for readability
-    pivot_heatmap = pivot_heatmap.loc[sorted(pivot_heatmap.index), sorted(pivot_heatmap.columns)]
+    # Top 10 countries x top 15 skills, already pivoted (and sorted) by DuckDB
+    pivot_heatmap = run_query(SKILL_HEATMAP_SQL).set_index('country').fillna(0)
+    pivot_heatmap = pivot_heatmap[sorted(pivot_heatmap.columns)]
     fig_heatmap = px.imshow(
         pivot_heatmap,
         labels=dict(x="Skill", y="Country", color="Job Count"),
@@ -191,9 +195,11 @@ with tab2:
 
 with tab3:
     st.subheader("Salary Insights")
-    salary_stats = run_query("SELECT skill AS 'Skill', median AS 'Median Salary (USD)', p75 AS '75th Percentile (USD)', p25 AS '25th Percentile (USD)', count AS 'Job Count' FROM salary_skill_stats ORDER BY median DESC LIMIT 20")
+    salary_stats = run_query_arrow("SELECT skill AS 'Skill', median AS 'Median Salary (USD)', p75 AS '75th Percentile (USD)', p25 AS '25th Percentile (USD)', count AS 'Job Count' FROM salary_skill_stats ORDER BY median DESC LIMIT 20")
     st.dataframe(salary_stats)
-    archetype_salary = run_query("SELECT cluster_name AS 'Job Archetype', ROUND(AVG(avg_salary_annual_usd),0) AS 'Average Salary (USD)' FROM job_postings GROUP BY cluster_name ORDER BY AVG(avg_salary_annual_usd) DESC")
+    archetype_salary = split_metric(job_aggregates, 'archetype_salary', ['cluster_name', 'avg_salary']).rename(
+        columns={'cluster_name': 'Job Archetype', 'avg_salary': 'Average Salary (USD)'}
+    ).sort_values(by='Average Salary (USD)', ascending=False, ignore_index=True)
     st.dataframe(archetype_salary)
     # --- Salary by Skill Visualization ---
     st.markdown("#### 💸 Salary Distribution by Skill")
@@ -217,8 +223,9 @@ with tab3:
     st.plotly_chart(fig_salary, use_container_width=True)
     # --- Salary Time Trend ---
     st.markdown("#### ⏳ Median Salary Trend Over Time")
-    salary_time = run_query("SELECT date_posted, AVG(avg_salary_annual_usd) AS avg_salary FROM job_postings WHERE avg_salary_annual_usd > 0 GROUP BY date_posted ORDER BY date_posted")
+    salary_time = split_metric(job_aggregates, 'salary_trend', ['date_posted', 'avg_salary'])
     salary_time['date_posted'] = pd.to_datetime(salary_time['date_posted'])
+    salary_time = salary_time.sort_values('date_posted')
     fig_salary_time = px.line(
         salary_time, x='date_posted', y='avg_salary',
         title='Average Salary Trend Over Time',
@@ -228,14 +235,17 @@ with tab3:
 
 with tab4:
     st.subheader("Geography & Companies")
-    country_counts = run_query("SELECT country AS 'Country', COUNT(*) AS 'Job Count' FROM job_postings GROUP BY country ORDER BY COUNT(*) DESC LIMIT 1000")
-    st.dataframe(country_counts)
+    country_counts = split_metric(job_aggregates, 'country', ['country', 'iso3', 'job_count']).rename(
+        columns={'country': 'Country', 'job_count': 'Job Count'}
+    ).astype({'Job Count': 'int64'}).sort_values(by='Job Count', ascending=False, ignore_index=True).head(1000)
+    st.dataframe(country_counts[['Country', 'Job Count']])
     # Global map visualization (Modern Design)
+    # Countries are located by the ISO-3 codes precomputed in the ETL
     st.markdown("#### Global Job Postings Map")
     fig = px.choropleth(
-        country_counts,
-        locations="Country",
-        locationmode="country names",
+        country_counts.dropna(subset=['iso3']),
+        locations="iso3",
+        locationmode="ISO-3",
         color="Job Count",
         hover_name="Country",
         color_continuous_scale=px.colors.sequential.Viridis,
@@ -275,7 +285,7 @@ with tab4:
         geo_bgcolor='rgba(0,0,0,0)',
     )
     st.plotly_chart(fig, use_container_width=True)
-    company_stats = run_query("SELECT company AS 'Company', job_count AS 'Job Count', median_salary AS 'Median Salary (USD)' FROM companies ORDER BY job_count DESC LIMIT 20")
+    company_stats = run_query_arrow("SELECT company AS 'Company', job_count AS 'Job Count', median_salary AS 'Median Salary (USD)' FROM companies ORDER BY job_count DESC LIMIT 20")
     st.dataframe(company_stats)
 
 st.markdown("---")
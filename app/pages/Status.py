@@ -23,30 +23,42 @@ This page provides up-to-date information about the status of job data collectio
 
 # --- Data Collection Status ---
 st.header("Job Data Collection Status")
-latest_job = run_query("SELECT MAX(date_posted) AS last_date FROM job_postings")
-total_jobs = run_query("SELECT COUNT(*) AS total FROM job_postings")
-total_companies = run_query("SELECT COUNT(DISTINCT company) AS companies FROM job_postings")
-total_countries = run_query("SELECT COUNT(DISTINCT country) AS countries FROM job_postings")
+# All four collection stats in a single scan of job_postings
+stats = run_query("""
+    SELECT
+        MAX(date_posted) AS last_date,
+        COUNT(*) AS total,
+        COUNT(DISTINCT company) AS companies,
+        COUNT(DISTINCT country) AS countries
+    FROM job_postings
+""").iloc[0]
 
 # Remove time from latest_job
-latest_job_date = pd.to_datetime(latest_job['last_date'][0]).date() if pd.notnull(latest_job['last_date'][0]) else "-"
+latest_job_date = pd.to_datetime(stats['last_date']).date() if pd.notnull(stats['last_date']) else "-"
 col1, col2, col3, col4 = st.columns(4)
 col1.metric("Latest Job Posting", str(latest_job_date))
-col2.metric("Total Job Postings", int(total_jobs['total'][0]))
-col3.metric("Unique Companies", int(total_companies['companies'][0]))
-col4.metric("Countries Covered", int(total_countries['countries'][0]))
+col2.metric("Total Job Postings", int(stats['total']))
+col3.metric("Unique Companies", int(stats['companies']))
+col4.metric("Countries Covered", int(stats['countries']))
 
 # --- Monthly Job Collection Trend ---
 st.header("Monthly Job Collection")
-jobs_over_time = run_query("""
-    SELECT date_posted FROM job_postings
+# Monthly totals from the daily counts table, smoothed with a centered
+# 3-month rolling average computed in DuckDB
+monthly_counts = run_query("""
+    SELECT
+        month AS "Month",
+        jobs AS "Jobs Collected",
+        AVG(jobs) OVER (ORDER BY month ROWS BETWEEN 1 PRECEDING AND 1 FOLLOWING) AS "Smoothed Jobs Collected"
+    FROM (
+        SELECT date_trunc('month', date_posted) AS month, CAST(SUM(job_count) AS BIGINT) AS jobs
+        FROM date_job_counts
+        WHERE date_posted IS NOT NULL  -- Remove undefined dates
+        GROUP BY ALL
+    )
+    ORDER BY month
 """)
-jobs_over_time["date_posted"] = pd.to_datetime(jobs_over_time["date_posted"])
-jobs_over_time = jobs_over_time.dropna(subset=["date_posted"])  # Remove undefined dates
-jobs_over_time["Month"] = jobs_over_time["date_posted"].dt.to_period("M").dt.to_timestamp()
-monthly_counts = jobs_over_time.groupby("Month").size().reset_index(name="Jobs Collected")
-# Smooth the line using a rolling average (window=3)
-monthly_counts["Smoothed Jobs Collected"] = monthly_counts["Jobs Collected"].rolling(window=3, min_periods=1, center=True).mean()
+monthly_counts["Month"] = pd.to_datetime(monthly_counts["Month"])
 
 # Create the line chart with Plotly Express
 fig = px.line(
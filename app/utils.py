@@ -8,11 +8,74 @@ from pathlib import Path
 from configparser import ConfigParser
 import duckdb
 import pandas as pd
+import streamlit as st
 
+# How long (in seconds) cached query results stay valid between reruns
+QUERY_CACHE_TTL = 3600
+# Lookup lists only change when the ETL runs, so they are cached for a day
+LOOKUP_CACHE_TTL = 86400
 
+# Dashboard filter conditions on job_postings. The SQL text is fixed and the
+# sidebar selections are bound as parameters ($1..$4, see job_filter_params),
+# so every rerun sends the same statement and no user value is spliced into SQL.
+JOB_FILTER_SQL = """
+    ($1 = 'All' OR contains(cluster_name, $1)) AND
+    ($2 = 'All' OR company = $2) AND
+    ($3 = 'All' OR work_type = $3) AND
+    ($4 = 'All' OR employment_type = $4)
+"""
+
+# Total, per-archetype and per-date job counts for the filtered job postings
+FILTERED_OVERVIEW_SQL = f"""
+    WITH filtered AS (
+        SELECT cluster_name, date_posted FROM job_postings WHERE {JOB_FILTER_SQL}
+    )
+    SELECT 'total' AS metric, COUNT(*) AS job_count FROM filtered
+    UNION ALL BY NAME
+    SELECT 'archetype' AS metric, cluster_name, COUNT(*) AS job_count
+    FROM filtered WHERE cluster_name IS NOT NULL GROUP BY cluster_name
+    UNION ALL BY NAME
+    SELECT 'date' AS metric, date_posted, COUNT(*) AS job_count
+    FROM filtered WHERE date_posted IS NOT NULL GROUP BY date_posted
+"""
+
+# Same result shape as FILTERED_OVERVIEW_SQL, read from the aggregate tables
+# materialized by the ETL (src/etl.py GOLD_AGGREGATES) when no filter is active
+GOLD_OVERVIEW_SQL = """
+    SELECT 'total' AS metric, CAST(SUM(job_count) AS BIGINT) AS job_count FROM country_job_counts
+    UNION ALL BY NAME
+    SELECT 'archetype' AS metric, cluster_name, job_count
+    FROM archetype_job_counts WHERE cluster_name IS NOT NULL
+    UNION ALL BY NAME
+    SELECT 'date' AS metric, date_posted, job_count
+    FROM date_job_counts WHERE date_posted IS NOT NULL
+"""
+
+# Skill demand heatmap: job counts of the top 15 skills in the top 10 countries
+# (by total job count), pivoted to one row per country and one column per skill
+SKILL_HEATMAP_SQL = """
+    WITH cells AS (
+        SELECT country, skill, count FROM country_skill_counts WHERE count > 0
+    ),
+    top_countries AS (
+        SELECT country FROM cells GROUP BY country ORDER BY SUM(count) DESC, country LIMIT 10
+    ),
+    top_skills AS (
+        SELECT skill FROM cells GROUP BY skill ORDER BY SUM(count) DESC, skill LIMIT 15
+    )
+    PIVOT (
+        SELECT * FROM cells
+        WHERE country IN (SELECT country FROM top_countries)
+          AND skill IN (SELECT skill FROM top_skills)
+    ) ON skill USING SUM(count) GROUP BY country ORDER BY country
+"""
+
+
+@st.cache_resource(show_spinner=False)
 def get_motherduck_connection(db_name="data_career_navigator"):
     """
     Returns a DuckDB connection to the specified MotherDuck database.
+    The connection is created once per process and reused across reruns.
     Requires MOTHERDUCK_TOKEN in environment or ~/.motherduck/credentials.
     """
     token = os.environ.get("MOTHERDUCK_TOKEN")
@@ -25,13 +88,82 @@ def get_motherduck_connection(db_name="data_career_navigator"):
             os.environ['MOTHERDUCK_TOKEN'] = config['default']['token']
     return duckdb.connect(f"md:{db_name}")
 
-def run_query(sql, db_name="data_career_navigator"):
+def _execute(sql, db_name, params, fetch):
+    """
+    Executes sql on a cursor of the shared MotherDuck connection and returns
+    fetch(result). If the shared connection has gone stale, it is dropped and
+    the query is retried once on a fresh connection.
+    """
+    for attempt in range(2):
+        con = None
+        try:
+            # Use a cursor so concurrent sessions don't share one connection's state
+            con = get_motherduck_connection(db_name).cursor()
+            return fetch(con.execute(sql, params))
+        except duckdb.ConnectionException:
+            if attempt:
+                raise
+            get_motherduck_connection.clear()
+        finally:
+            if con is not None:
+                con.close()
+
+@st.cache_data(ttl=QUERY_CACHE_TTL, show_spinner=False)
+def run_query(sql, db_name="data_career_navigator", params=None):
     """
     Runs a SQL query against MotherDuck and returns a pandas DataFrame.
+    Optional params are bound to the query's placeholders ($1, $2, ...).
+    Results are cached on (sql, db_name, params) for QUERY_CACHE_TTL seconds.
     """
-    con = get_motherduck_connection(db_name)
-    return con.execute(sql).fetchdf()
+    return _execute(sql, db_name, params, lambda result: result.fetchdf())
 
-def get_table_preview(table, n=10, db_name="data_career_navigator"):
-    sql = f"SELECT * FROM {table} LIMIT {n}"
+@st.cache_data(ttl=QUERY_CACHE_TTL, show_spinner=False)
+def run_query_arrow(sql, db_name="data_career_navigator", params=None):
+    """
+    Same as run_query, but returns a pyarrow Table without converting to pandas.
+    Use it for results that are only displayed (st.dataframe accepts Arrow directly).
+    """
+    return _execute(sql, db_name, params, lambda result: result.fetch_arrow_table())
+
+@st.cache_data(ttl=QUERY_CACHE_TTL, show_spinner=False)
+def get_table_preview(table, columns=None, n=10, db_name="data_career_navigator"):
+    """
+    Returns the first n rows of a table, projected to the given columns (all if None).
+    """
+    select_cols = ", ".join(columns) if columns else "*"
+    sql = f"SELECT {select_cols} FROM {table} LIMIT {n}"
     return run_query(sql, db_name)
+
+@st.cache_data(ttl=LOOKUP_CACHE_TTL, show_spinner=False)
+def load_lookup_options(column, db_name="data_career_navigator"):
+    """
+    Returns the sorted values of a dim_<column> lookup table built by the ETL
+    (e.g. column='skill' reads dim_skill).
+    """
+    options = run_query(f"SELECT {column} FROM dim_{column} ORDER BY {column}", db_name)
+    return options[column].astype(str).tolist()
+
+def load_company_options(db_name="data_career_navigator"):
+    """
+    Returns the sorted company names from the dim_company lookup table.
+    """
+    return load_lookup_options("company", db_name)
+
+def load_skill_options(db_name="data_career_navigator"):
+    """
+    Returns the sorted skill names from the dim_skill lookup table.
+    """
+    return load_lookup_options("skill", db_name)
+
+def job_filter_params(skill="All", company="All", work_type="All", employment_type="All"):
+    """
+    Returns the bind parameters for JOB_FILTER_SQL, in placeholder order.
+    """
+    return [skill, company, work_type, employment_type]
+
+def split_metric(df, metric, columns):
+    """
+    Selects the rows of one metric from a combined (UNION ALL BY NAME) aggregate
+    result, keeping only the given columns.
+    """
+    return df.loc[df['metric'] == metric, columns].reset_index(drop=True)
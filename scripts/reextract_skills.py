@@ -4,35 +4,133 @@ Module for re-extracting and normalizing technical skills from job descriptions
 Only updates the skill columns without modifying the rest of the dataset.
 Use only if the skill extraction logic has changed or needs to be re-applied.
 Otherwise, ETL will handle this automatically.
+
+The keyword scan runs in a numba-compiled kernel over the UTF-8 bytes of all
+descriptions, parallelized across rows. It reproduces the word-boundary matching
+of extract_skills in src/extractors/skills_extractor.py. Compiled kernels are
+cached on disk (numba cache=True, in __pycache__), so only the first run pays
+the JIT compilation cost.
 """
 import sys
 import os
+import re
 sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+import duckdb
+import numpy as np
 import pandas as pd
-from src.extractors.skills_extractor import extract_skills
+import pyarrow as pa
+from numba import njit, prange
+from src.extractors.skills_extractor import (
+    KEYWORDS_PROGRAMMING,
+    KEYWORDS_LIBRARIES,
+    KEYWORDS_ANALYST_TOOLS,
+    KEYWORDS_CLOUD_TOOLS,
+    normalize_skill,
+)
+
+# Skill columns to update, mapped to their keyword lists
+SKILL_KEYWORDS = {
+    "programming_languages": KEYWORDS_PROGRAMMING,
+    "libraries": KEYWORDS_LIBRARIES,
+    "analyst_tools": KEYWORDS_ANALYST_TOOLS,
+    "cloud_platforms": KEYWORDS_CLOUD_TOOLS,
+}
+
+# Non-ASCII characters are collapsed to one placeholder byte each, so that the
+# kernel can tell word from non-word characters exactly like re's \b does.
+# Keywords are all ASCII, so matching itself is unaffected.
+NON_ASCII_WORD_CHAR = re.compile(r'(?![\x00-\x7f])\w')
+NON_ASCII_OTHER_CHAR = re.compile(r'[^\x00-\x80]')
+WORD_PLACEHOLDER = 0x80
+
+
+def to_kernel_bytes(text):
+    """Lowercases text and encodes it as one byte per character for the kernel."""
+    if not isinstance(text, str):
+        return b''
+    text = NON_ASCII_WORD_CHAR.sub('\x80', text.lower())
+    return NON_ASCII_OTHER_CHAR.sub('\x81', text).encode('latin-1')
+
+
+def pack(byte_strings):
+    """Packs byte strings into a flat uint8 buffer plus CSR-style offsets."""
+    offsets = np.zeros(len(byte_strings) + 1, dtype=np.int64)
+    offsets[1:] = np.cumsum([len(b) for b in byte_strings])
+    data = np.frombuffer(b''.join(byte_strings), dtype=np.uint8)
+    return data, offsets
+
+
+@njit(inline='always', cache=True)
+def _is_word(c):
+    return (
+        (48 <= c <= 57) or (65 <= c <= 90) or (97 <= c <= 122)
+        or c == 95 or c == WORD_PLACEHOLDER
+    )
+
 
-# Load the enriched jobs dataset
-input_path = "data/silver/enriched_jobs.csv"
-df = pd.read_csv(input_path)
+@njit(parallel=True, cache=True)
+def match_keywords(text, text_offsets, keywords, keyword_offsets):
+    """
+    Returns a (rows x keywords) boolean matrix where cell (i, k) is True if
+    keyword k occurs in text i delimited by word boundaries (regex \\b).
+    """
+    n_rows = len(text_offsets) - 1
+    n_keywords = len(keyword_offsets) - 1
+    out = np.zeros((n_rows, n_keywords), dtype=np.bool_)
+    for i in prange(n_rows):
+        start = text_offsets[i]
+        end = text_offsets[i + 1]
+        for k in range(n_keywords):
+            k_start = keyword_offsets[k]
+            k_len = keyword_offsets[k + 1] - k_start
+            first_is_word = _is_word(keywords[k_start])
+            last_is_word = _is_word(keywords[k_start + k_len - 1])
+            for p in range(start, end - k_len + 1):
+                j = 0
+                while j < k_len and text[p + j] == keywords[k_start + j]:
+                    j += 1
+                if j < k_len:
+                    continue
+                before_is_word = _is_word(text[p - 1]) if p > start else False
+                after_is_word = _is_word(text[p + k_len]) if p + k_len < end else False
+                if before_is_word != first_is_word and after_is_word != last_is_word:
+                    out[i, k] = True
+                    break
+    return out
 
-# Skill columns to update
-skill_cols = [
-    "programming_languages",
-    "libraries",
-    "analyst_tools",
-    "cloud_platforms"
-]
 
-# Apply skill extraction and normalization to each row's description
+# Load only the descriptions from the enriched jobs dataset
 # (Assumes a 'description' column exists)
-def extract_and_update_skills(row):
-    skills = extract_skills(row.get('description', ''))
-    for col in skill_cols:
-        row[col] = ";".join(skills[col])
-    return row
+input_path = "data/silver/enriched_jobs.parquet"
+descriptions = pd.read_parquet(input_path, columns=['description'])['description']
 
-df = df.apply(extract_and_update_skills, axis=1)
+# Encode all descriptions once, then scan them against every skill vocabulary
+text, text_offsets = pack([to_kernel_bytes(t) for t in descriptions])
+skills = {}
+for col, keywords in SKILL_KEYWORDS.items():
+    keyword_bytes, keyword_offsets = pack([kw.encode('ascii') for kw in keywords])
+    found = match_keywords(text, text_offsets, keyword_bytes, keyword_offsets)
+    normalized = np.array([normalize_skill(kw) for kw in keywords], dtype=object)
+    skills[col] = pa.array([";".join(sorted(set(normalized[row]))) for row in found], type=pa.string())
 
-# Save the updated file (overwrite or create a new one)
-df.to_csv("data/silver/enriched_jobs.csv", index=False)
-print("Skill extraction and normalization complete. Output: data/silver/enriched_jobs.csv")
+# Replace only the skill columns; DuckDB streams the other columns from the
+# input file to the output as-is, without loading the table into memory
+skills = pa.table({'row_id': pa.array(np.arange(len(descriptions), dtype=np.int64)), **skills})
+con = duckdb.connect()
+con.register('skills', skills)
+existing = {row[0] for row in con.execute(f"DESCRIBE SELECT * FROM read_parquet('{input_path}')").fetchall()}
+replaced = ", ".join(f"s.{col} AS {col}" for col in SKILL_KEYWORDS if col in existing)
+appended = "".join(f", s.{col}" for col in SKILL_KEYWORDS if col not in existing)
+# Write to a temporary file first, since input and output are the same file
+tmp_path = input_path + ".tmp"
+con.execute(f"""
+    COPY (
+        SELECT j.* EXCLUDE (file_row_number){f' REPLACE ({replaced})' if replaced else ''}{appended}
+        FROM read_parquet('{input_path}', file_row_number = true) AS j
+        JOIN skills AS s ON s.row_id = j.file_row_number
+        ORDER BY j.file_row_number
+    ) TO '{tmp_path}' (FORMAT PARQUET, COMPRESSION ZSTD)
+""")
+con.close()
+os.replace(tmp_path, input_path)
+print(f"Skill extraction and normalization complete. Output: {input_path}")
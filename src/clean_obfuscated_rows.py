@@ -2,33 +2,46 @@
 Script: clean_obfuscated_rows.py
 -------------------------------
 Removes rows where all key columns (location, company) are obfuscated.
-Input: data/silver/enriched_jobs.csv
-Output: data/silver/enriched_jobs.csv
+Input: data/silver/enriched_jobs.parquet
+Output: data/silver/enriched_jobs.parquet
 Only use this if separate obfuscation cleaning is needed.
 Otherwise, it's already handled in the main ETL pipeline.
+
+The file is streamed through DuckDB (read, filter, write) rather than loaded
+into a pandas DataFrame, so memory use does not grow with the file size.
 """
 
 # Import necessary libraries
+import os
 from pathlib import Path
-import pandas as pd
-from extractors.obfuscation_cleaner import drop_obfuscated_rows
+import duckdb
 
 # Define input/output paths
-INPUT_PATH = Path("data/silver/enriched_jobs.csv")
-OUTPUT_PATH = Path("data/silver/enriched_jobs.csv")
+INPUT_PATH = Path("data/silver/enriched_jobs.parquet")
+OUTPUT_PATH = Path("data/silver/enriched_jobs.parquet")
+
+# Same rule as extractors.obfuscation_cleaner.is_obfuscated:
+# a value is obfuscated if it is missing or has no alphanumeric characters
+OBFUSCATED_SQL = "({col} IS NULL OR NOT regexp_matches({col}, '[a-zA-Z0-9]'))"
 
 # Check if input file exists
 if not INPUT_PATH.exists():
     raise FileNotFoundError(f"Input file not found: {INPUT_PATH}")
 
-# Read the input CSV file
-df = pd.read_csv(INPUT_PATH)
-
-# Remove rows where all key columns (location, company) are obfuscated
-df_clean = drop_obfuscated_rows(df, key_cols=['location', 'company'])
-
 # Ensure output directory exists
-# and save the cleaned dataset
 OUTPUT_PATH.parent.mkdir(parents=True, exist_ok=True)
-df_clean.to_csv(OUTPUT_PATH, index=False)
+# Write to a temporary file first, since input and output may be the same file
+tmp_path = OUTPUT_PATH.with_suffix(OUTPUT_PATH.suffix + ".tmp")
+
+# Remove rows where all key columns (location, company) are obfuscated
+con = duckdb.connect()
+kept = con.execute(f"""
+    COPY (
+        SELECT * FROM read_parquet('{INPUT_PATH.as_posix()}')
+        WHERE NOT ({OBFUSCATED_SQL.format(col='location')} AND {OBFUSCATED_SQL.format(col='company')})
+    ) TO '{tmp_path.as_posix()}' (FORMAT PARQUET, COMPRESSION ZSTD)
+""").fetchone()[0]
+con.close()
+os.replace(tmp_path, OUTPUT_PATH)
+print(f"Kept {kept} rows where at least one key column is not obfuscated")
 print(f"✅ Cleaned data saved to: {OUTPUT_PATH}")
@@ -8,11 +8,32 @@ Intended to be run monthly via GitHub Actions.
 
 # Import necessary libraries
 import os
-import subprocess
 import shutil
+import hashlib
+import zipfile
 from kaggle.api.kaggle_api_extended import KaggleApi
 import pandas as pd
 
+# Rows per chunk when streaming the bronze CSVs during the append step
+INGEST_CHUNKSIZE = 100_000
+
+def row_hashes(df):
+    """
+    Returns a 64-bit fingerprint per row of df (over all of its columns) as a
+    Series aligned with df, used to detect rows already present in the master file.
+    """
+    return pd.util.hash_pandas_object(df, index=False)
+
+def file_digest(path, block_size=1 << 20):
+    """
+    Returns the SHA-256 hex digest of a file, read in 1 MiB blocks.
+    """
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for block in iter(lambda: f.read(block_size), b""):
+            digest.update(block)
+    return digest.hexdigest()
+
 def test_kaggle_credentials():
     """
     Verifies that Kaggle credentials are valid by attempting to authenticate.
@@ -20,17 +41,20 @@ def test_kaggle_credentials():
     If the credentials are invalid, this function will raise an exception.
 
     This function is intended to be used as a sanity check before attempting
-    to download data from Kaggle.
+    to download data from Kaggle. Returns the authenticated API client so it
+    can be reused for the download.
     """
     api = KaggleApi()
     api.authenticate()
     print("Kaggle credentials are valid.")
+    return api
 
 def download_kaggle_csv(
     dataset="joykimaiyo18/linkedin-data-jobs-dataset",
     filename="clean_jobs.csv",
     dest_folder="data/bronze",
-    output_filename="clean_jobs_latest.csv"
+    output_filename="clean_jobs_latest.csv",
+    api=None
 ):
     """
     Downloads a CSV file from a Kaggle dataset using the Kaggle API.
@@ -43,49 +67,73 @@ def download_kaggle_csv(
         which is actually data/bronze/clean_jobs.csv at the repo root when run locally,
         but in GitHub Actions, the working directory is the repo root, so ../data/bronze
         points outside the repo.
+        output_filename (str): Name to give the downloaded file in dest_folder.
+        api (KaggleApi): Authenticated client to reuse; a new one is created if None.
     """
     os.makedirs(dest_folder, exist_ok=True)
-    # Download using Kaggle CLI to dest_folder
-    cmd = [
-        "kaggle", "datasets", "download", dataset,
-        "-f", filename, "--unzip", "-p", dest_folder
-    ]
-    print(f"Running command: {' '.join(cmd)}")
+    if api is None:
+        api = KaggleApi()
+        api.authenticate()
+    # Download only the requested file in-process with the Kaggle API to dest_folder
+    print(f"Downloading {filename} from {dataset} to {dest_folder}")
     try:
-        subprocess.run(cmd, check=True)
+        api.dataset_download_file(dataset, filename, path=dest_folder, force=True, quiet=True)
+        downloaded_path = os.path.join(dest_folder, filename)
+        # Kaggle serves larger files zipped, as <filename>.zip
+        zip_path = downloaded_path + ".zip"
+        if os.path.exists(zip_path):
+            with zipfile.ZipFile(zip_path) as zf:
+                zf.extract(filename, dest_folder)
+            os.remove(zip_path)
         print(f"Downloaded {filename} to {dest_folder}")
         # If the file is not already named as output_filename, rename it
-        downloaded_path = os.path.join(dest_folder, filename)
         output_path = os.path.join(dest_folder, output_filename)
         if filename != output_filename:
-            if os.path.exists(output_path):
-                os.remove(output_path)
-            os.rename(downloaded_path, output_path)
+            # Atomic, and overwrites an existing output_path on every platform
+            os.replace(downloaded_path, output_path)
             print(f"Renamed {downloaded_path} to {output_path}")
-    except subprocess.CalledProcessError as e:
+    except Exception as e:
         print(f"Error occurred: {e}")
         print("Ensure Kaggle credentials are correctly configured and the dataset is accessible.")
         raise
 
-# Main execution boilerplate block
-if __name__ == "__main__":
-    test_kaggle_credentials()
-    download_kaggle_csv(output_filename="clean_jobs_latest.csv")
+def run_ingestion():
+    """
+    Downloads the latest Kaggle CSV and merges it into data/bronze/clean_jobs.csv,
+    deduplicating on the job link column when available.
+    """
+    api = test_kaggle_credentials()
+    download_kaggle_csv(output_filename="clean_jobs_latest.csv", api=api)
 
     master_path = os.path.join("data", "bronze", "clean_jobs.csv")
     latest_path = os.path.join("data", "bronze", "clean_jobs_latest.csv")
+    # Digest of the last download that was merged into the master file
+    digest_path = os.path.join("data", "bronze", ".latest.sha256")
+
+    # Skip the append entirely if the dataset has not changed since the last run
+    latest_digest = file_digest(latest_path)
+    if os.path.exists(master_path) and os.path.exists(digest_path):
+        with open(digest_path) as f:
+            if f.read().strip() == latest_digest:
+                os.remove(latest_path)
+                print(f"{latest_path} is unchanged since the last run. Nothing to append.")
+                return
+
+    # Set once the download has been fully merged into the master file
+    merged = False
 
     # Check if master file exists
     if not os.path.exists(master_path):
-        # If not, copy it from the latest file (do not remove the latest file)
+        # If not, copy it from the latest file (only the first row is parsed,
+        # to check that it is not empty)
         print(f"{master_path} does not exist. Creating it from {latest_path}.")
         try:
-            df_latest = pd.read_csv(latest_path)
-            if df_latest.empty:
+            if pd.read_csv(latest_path, nrows=1).empty:
                 print(f"Warning: {latest_path} is empty. Master file not created.")
             else:
                 shutil.copyfile(latest_path, master_path)
-                print(f"Created {master_path} with {len(df_latest)} rows.")
+                merged = True
+                print(f"Created {master_path} from {latest_path}.")
         except Exception as e:
             print(f"Error reading {latest_path}: {e}")
         finally:
@@ -96,36 +144,60 @@ if __name__ == "__main__":
         # If master exists, append only new rows
         print(f"Appending new data from {latest_path} to {master_path} (deduplicating)...")
         try:
-            df_master = pd.read_csv(master_path)
-        except Exception as e:
-            print(f"Error reading {master_path}: {e}")
-            df_master = pd.DataFrame()
-        try:
-            df_latest = pd.read_csv(latest_path)
+            master_cols = pd.read_csv(master_path, nrows=0).columns.tolist()
+            latest_cols = pd.read_csv(latest_path, nrows=0).columns.tolist()
         except Exception as e:
-            print(f"Error reading {latest_path}: {e}")
-            df_latest = pd.DataFrame()
-        if df_latest.empty:
+            # Fail the run (without recording the download as merged), so that
+            # the next run retries the same file
+            print(f"Error reading {master_path} or {latest_path}: {e}")
+            os.remove(latest_path)
+            print(f"Removed temporary file {latest_path}.")
+            raise
+        if not latest_cols:
             print(f"No new data found in {latest_path}. Nothing to append.")
         else:
             # Specify deduplication key columns if available, else all columns
-            dedup_cols = None
+            dedup_cols = master_cols
             # Prefer 'link' or 'job_url' as deduplication key
             for col in ["link", "job_url", "job_url", "Job URL", "Job Url", "JobURL"]:
-                if col in df_latest.columns and col in df_master.columns:
+                if col in latest_cols and col in master_cols:
                     dedup_cols = [col]
                     print(f"Deduplicating on column: {col}")
                     break
-            if dedup_cols is None:
+            if len(dedup_cols) != 1:
                 print("No unique job link column found. Deduplicating on all columns.")
-            before_rows = len(df_master)
-            df_combined = pd.concat([df_master, df_latest], ignore_index=True)
-            df_combined = df_combined.drop_duplicates(subset=dedup_cols)
-            after_rows = len(df_combined)
-            new_rows = after_rows - before_rows
-            df_combined.to_csv(master_path, index=False)
+            # Stream the master file once to collect the hashes of its keys, then
+            # append only unseen rows from the latest file, chunk by chunk
+            seen = set()
+            before_rows = 0
+            for chunk in pd.read_csv(master_path, usecols=dedup_cols, dtype=str, chunksize=INGEST_CHUNKSIZE):
+                seen.update(row_hashes(chunk[dedup_cols]).tolist())
+                before_rows += len(chunk)
+            new_rows = 0
+            for chunk in pd.read_csv(latest_path, dtype=str, chunksize=INGEST_CHUNKSIZE):
+                chunk = chunk.reindex(columns=master_cols)
+                # Keep rows not in the master file and not repeated within the latest file
+                hashes = row_hashes(chunk[dedup_cols])
+                keep = ~hashes.isin(seen) & ~hashes.duplicated()
+                seen.update(hashes[keep].tolist())
+                chunk = chunk[keep]
+                # The master file only ever grows by appending the new rows
+                chunk.to_csv(master_path, mode="a", header=False, index=False, lineterminator="\n")
+                new_rows += len(chunk)
+            after_rows = before_rows + new_rows
+            merged = True
             print(f"Appended and deduplicated. {new_rows} new rows added. Master file now has {after_rows} rows.")
         # Remove the temporary latest file
         if os.path.exists(latest_path):
             os.remove(latest_path)
-            print(f"Removed temporary file {latest_path}.")
\ No newline at end of file
+            print(f"Removed temporary file {latest_path}.")
+
+    # Remember which download the master file now includes (the monthly
+    # workflow commits this file along with the master file)
+    if merged:
+        with open(digest_path, "w") as f:
+            f.write(latest_digest + "\n")
+
+# Main execution boilerplate block
+if __name__ == "__main__":
+    run_ingestion()
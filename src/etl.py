@@ -13,7 +13,7 @@ Input:
     data/bronze/clean_jobs_with_header.csv
 
 Intermediate:
-    data/silver/enriched_jobs.csv
+    data/silver/enriched_jobs.parquet
 Output:
     data/gold/*.parquet
     gold layers to motherduck for analysis
@@ -31,7 +31,8 @@ For a complete ETL workflow, follow these steps:
    ```bash
    python src/etl.py load_motherduck
    ```
-   - This uploads (appends) the Parquet data to our MotherDuck database tables.
+   - This uploads (appends) the Parquet data to our MotherDuck database tables,
+     then rebuilds the small aggregate tables the dashboard reads (see GOLD_AGGREGATES).
 
 Summary:  
 - Step 1: Run ETL and generate files.
@@ -42,21 +43,30 @@ We can repeat step 2 as often as we want to append new data to MotherDuck, after
 # Import necessary libraries
 import sys
 import os
+import hashlib
 import warnings
 from pathlib import Path
 from configparser import ConfigParser
-from collections import Counter, defaultdict
+from collections import Counter
+from itertools import chain
+from functools import lru_cache
 import pandas as pd
 import numpy as np
+import pyarrow as pa
+import pyarrow.compute as pc
+import pyarrow.csv as pacsv
+import pyarrow.parquet as pq
 from sklearn.cluster import KMeans
+from sklearn.preprocessing import MultiLabelBinarizer
+from joblib import Parallel, delayed
 import duckdb
 # Import custom extractors
 from extractors.salary_extractor import SalaryETL
-from extractors.experience_extractor import categorize_experience
+from extractors.experience_extractor import categorize_experience, EXPERIENCE_LEVELS
 from extractors.skills_extractor import extract_skills
-from extractors.job_type_extractor import extract_work_type, extract_employment_type
+from extractors.job_type_extractor import work_type_from_text, employment_type_from_text, WORK_TYPES, EMPLOYMENT_TYPES
 from extractors.obfuscation_cleaner import drop_obfuscated_rows
-from extractors.location_extractor import extract_country
+from extractors.location_extractor import extract_countries, cc
 
 warnings.filterwarnings('ignore')
 # Add the parent directory to the system path for credentials import
@@ -71,11 +81,145 @@ sys.path.append(str(Path(__file__).resolve().parent.parent))
 
 # Define input/output paths
 INPUT_PATH = Path("data/bronze/clean_jobs_with_header.csv")
-OUTPUT_PATH = Path("data/silver/enriched_jobs.csv")
+OUTPUT_PATH = Path("data/silver/enriched_jobs.parquet")
+# SHA-256 of the bronze input that OUTPUT_PATH was last built from
+INPUT_DIGEST_PATH = OUTPUT_PATH.with_name(".enriched_jobs.sha256")
+
+@lru_cache(maxsize=None)
+def get_salary_etl():
+    """
+    Returns the process-wide SalaryETL instance, so its compiled patterns and
+    cached exchange rates are reused by every enrich_job_postings call.
+    """
+    return SalaryETL()
+
+# Skill list columns produced by extract_skills
+SKILL_COLUMNS = ['programming_languages', 'libraries', 'analyst_tools', 'cloud_platforms']
+# Number of row chunks the text extraction is split into (spread over all cores)
+ENRICH_N_CHUNKS = 4 * (os.cpu_count() or 1)
+
+def _header_first(classify, header_text, text):
+    """
+    Applies a work/employment type classifier (work_type_from_text or
+    employment_type_from_text) to the header's text first, falling back to the
+    title+description text when the header says nothing. Both texts are
+    lowercased "title description" strings; header_text is '' without a header.
+    """
+    if header_text:
+        value = classify(header_text)
+        if value != 'Not Specified':
+            return value
+    return classify(text)
+
+def _enrich_chunk(chunk):
+    """
+    Runs the text extractors (experience, skills, work and employment type) on
+    a chunk of job postings. Module-level so it can run in a worker process.
+
+    :param chunk: DataFrame with 'title', 'description' and optionally 'header_text'
+    :return: DataFrame with one column per extracted feature, indexed like chunk
+    """
+    titles = chunk['title'].to_numpy()
+    descriptions = chunk['description'].to_numpy()
+    if 'header_text' in chunk.columns:
+        headers = chunk['header_text'].to_numpy()
+    else:
+        headers = np.full(len(chunk), '', dtype=object)
+    # One pass over the column arrays computes every feature of a row
+    experience, skills, work_types, employment_types = [], [], [], []
+    for header, title, description in zip(headers, titles, descriptions):
+        experience.append(categorize_experience(title, description))
+        skills.append(extract_skills(description))
+        # Lowercase the job type texts once for both classifiers (the header
+        # stands in for both title and description, as before)
+        header_text = f"{header} {header}".lower() if header else ''
+        text = f"{title} {description}".lower()
+        work_types.append(_header_first(work_type_from_text, header_text, text))
+        employment_types.append(_header_first(employment_type_from_text, header_text, text))
+    # The skills dicts become the four skill columns in a single construction
+    out = pd.DataFrame.from_records(skills, columns=SKILL_COLUMNS, index=chunk.index)
+    # Small fixed vocabularies: store as categoricals (integer codes) instead of strings
+    out.insert(0, 'experience_level', pd.Categorical(experience, categories=EXPERIENCE_LEVELS))
+    out['work_type'] = pd.Categorical(work_types, categories=WORK_TYPES)
+    out['employment_type'] = pd.Categorical(employment_types, categories=EMPLOYMENT_TYPES)
+    return out
+
+# Bronze columns read by the ETL, with fixed types so the parser skips type
+# inference. work_type and employment_type are left out: they are empty in the
+# bronze data and recomputed by enrich_job_postings.
+BRONZE_COLUMN_TYPES = {
+    'id': pa.int64(),
+    'title': pa.string(),
+    'company': pa.string(),
+    'location': pa.string(),
+    'link': pa.string(),
+    'source': pa.string(),
+    'date_posted': pa.string(),
+    'description': pa.string(),
+    'header_text': pa.string(),
+}
+# Bytes per block handed to each pyarrow CSV parsing thread (default is 1 MiB)
+BRONZE_CSV_BLOCK_SIZE = 16 * 1024 * 1024
+
+# Types of the SalaryETL output columns in the silver file. A chunk without any
+# salaries would otherwise get untyped (all-null) columns.
+SILVER_SALARY_TYPES = {
+    'has_salary': pa.bool_(),
+    'currency_raw': pa.string(),
+    'min_salary_raw': pa.float64(),
+    'max_salary_raw': pa.float64(),
+    'single_salary_raw': pa.float64(),
+    'salary_period': pa.string(),
+    'min_salary_annual_usd': pa.float64(),
+    'max_salary_annual_usd': pa.float64(),
+    'avg_salary_annual_usd': pa.float64(),
+    'salary_confidence': pa.float64(),
+}
+
+def iter_bronze_csv(path):
+    """
+    Streams the BRONZE_COLUMN_TYPES columns of a bronze CSV with pyarrow's
+    CSV reader, yielding one pandas DataFrame per BRONZE_CSV_BLOCK_SIZE block.
+    Descriptions may span several lines, empty cells become missing values
+    (as with pd.read_csv) and columns absent from the file (e.g. header_text)
+    come back empty.
+    """
+    reader = pacsv.open_csv(
+        path,
+        read_options=pacsv.ReadOptions(block_size=BRONZE_CSV_BLOCK_SIZE),
+        parse_options=pacsv.ParseOptions(newlines_in_values=True),
+        convert_options=pacsv.ConvertOptions(
+            column_types=BRONZE_COLUMN_TYPES,
+            include_columns=list(BRONZE_COLUMN_TYPES),
+            include_missing_columns=True,
+            strings_can_be_null=True,
+        ),
+    )
+    for batch in reader:
+        yield batch.to_pandas()
+
+def to_silver_table(df, schema=None):
+    """
+    Converts an enriched DataFrame to an Arrow table in the silver layout: skill
+    lists joined into semicolon-separated strings (by Arrow's vectorized
+    binary_join) and salary columns with fixed types. If schema is given (the
+    one of the first chunk written), the table is cast to it.
+    """
+    table = pa.Table.from_pandas(df, preserve_index=False)
+    for col in SKILL_COLUMNS:
+        idx = table.schema.get_field_index(col)
+        table = table.set_column(idx, col, pc.binary_join(table[col].cast(pa.list_(pa.string())), ';'))
+    for col, typ in SILVER_SALARY_TYPES.items():
+        idx = table.schema.get_field_index(col)
+        if idx >= 0:
+            table = table.set_column(idx, col, table[col].cast(typ))
+    return table if schema is None else table.cast(schema)
 
 def enrich_job_postings(df):
     """
     Enriches a DataFrame with additional features extracted from job postings.
+    Rows whose key columns are all obfuscated are dropped first; the remaining
+    rows are normalized and enriched in a new DataFrame (df is left unchanged).
 
     Parameters:
         df (pd.DataFrame): Raw DataFrame with at least 'header_text', 'title' and 'description' columns.
@@ -89,82 +233,59 @@ def enrich_job_postings(df):
     if missing:
         raise ValueError(f"Input DataFrame is missing required columns: {missing}")
 
-    # --- Normalize text fields before any extraction ---
-    df = df.copy()
-    df['title'] = df['title'].fillna('').astype(str).str.strip()
-    df['description'] = df['description'].fillna('').astype(str).str.strip()
-
-    # Salary Extraction using SalaryETL with header_text as primary source, fallback to title+description
-    salary_etl = SalaryETL()
-    # First, try extracting salary from header_text only
-    df_with_header = salary_etl.process_job_dataframe(
-        df,
-        text_column='header_text',
-        include_title=False,
-        title_column='title'  # not used, but required by signature
-    )
-
-    # Identify rows where salary was not extracted from header_text
-    missing_salary_mask = ~df_with_header['has_salary'].fillna(False).astype(bool)
-
-    # For those rows, fallback to title+description extraction
-    if missing_salary_mask.any():
-        df_fallback = salary_etl.process_job_dataframe(
-            df_with_header.loc[missing_salary_mask],
-            text_column='description',
-            include_title=True,
-            title_column='title'
-        )
-        # Update only the missing rows with fallback extraction results
-        for col in [
-            'has_salary', 'currency_raw', 'min_salary_raw', 'max_salary_raw',
-            'single_salary_raw', 'salary_period', 'min_salary_annual_usd',
-            'max_salary_annual_usd', 'avg_salary_annual_usd', 'salary_confidence']:
-            df_with_header.loc[missing_salary_mask, col] = df_fallback[col]
-
-    df = df_with_header
-
-    # Experience Level Extraction
-    df['experience_level'] = df.apply(
-        lambda row: categorize_experience(str(row.get('title', '')), str(row.get('description', ''))),
-        axis=1
-    )
-
-    # Remove rows where all key columns (location, company) are obfuscated
+    # Remove rows where all key columns (location, company) are obfuscated,
+    # before spending any extraction work on them
     df = drop_obfuscated_rows(df, key_cols=['location', 'company'])
 
+    # --- Normalize text fields before any extraction (in place, no full copy of df) ---
+    # Arrow-backed strings: fillna and strip run as vectorized Arrow kernels
+    for col in ['title', 'description', 'header_text']:
+        if col in df.columns:
+            df[col] = df[col].astype('string[pyarrow]').fillna('').str.strip()
+
     # Extract country from 'location' column if present
     if 'location' in df.columns:
-        print(f"Extracting country from location column for {len(df)} rows. This may take a while if geocoding is needed...")
-        df['country'] = df['location'].apply(extract_country)
+        df['country'] = extract_countries(df['location'])
     else:
         df['country'] = 'Unknown'
 
+    # Salary Extraction using SalaryETL. process_job_dataframe already tries each
+    # row's header_text first and falls back to title+description, so a single
+    # pass covers both sources (and skips the header when it is missing or empty)
+    df = get_salary_etl().process_job_dataframe(
+        df,
+        text_column='description',
+        include_title=True,
+        title_column='title'
+    )
+
+    # The text extractors only depend on the text columns, so run them once per
+    # distinct (header_text, title, description) combination (reposts share them)
+    text_cols = [col for col in ['header_text', 'title', 'description'] if col in df.columns]
+    text = df[text_cols]
+    codes = text.groupby(text_cols, sort=False).ngroup().to_numpy()
+    unique_text = text.iloc[np.unique(codes, return_index=True)[1]]
+
+    # Run the text extractors on chunks of rows in parallel worker processes
+    chunk_size = max(1, -(-len(unique_text) // ENRICH_N_CHUNKS))
+    chunks = [unique_text.iloc[start:start + chunk_size] for start in range(0, len(unique_text), chunk_size)]
+    if len(chunks) > 1:
+        extracted = pd.concat(Parallel(n_jobs=-1)(delayed(_enrich_chunk)(chunk) for chunk in chunks))
+    else:
+        extracted = _enrich_chunk(unique_text)
+    # Map the results back to every row
+    extracted = extracted.iloc[codes].set_axis(df.index)
+
+    # Experience Level Extraction
+    df['experience_level'] = extracted['experience_level']
+
     # Skill Extraction
-    skill_columns = ['programming_languages', 'libraries', 'analyst_tools', 'cloud_platforms']
-    extracted_skills = df['description'].apply(extract_skills)
-    for col in skill_columns:
-        df[col] = extracted_skills.apply(lambda skills: skills.get(col, []))
-
-    # Work Type and Employment Type Extraction: use header_text first, fallback to title+description
-    def get_work_type(row):
-        header = str(row.get('header_text', '') or '').strip()
-        if header:
-            wt = extract_work_type(header, header)
-            if wt != 'Not Specified':
-                return wt
-        return extract_work_type(str(row.get('title', '')), str(row.get('description', '')))
-
-    def get_employment_type(row):
-        header = str(row.get('header_text', '') or '').strip()
-        if header:
-            et = extract_employment_type(header, header)
-            if et != 'Not Specified':
-                return et
-        return extract_employment_type(str(row.get('title', '')), str(row.get('description', '')))
-
-    df['work_type'] = df.apply(get_work_type, axis=1)
-    df['employment_type'] = df.apply(get_employment_type, axis=1)
+    for col in SKILL_COLUMNS:
+        df[col] = extracted[col]
+
+    # Work Type and Employment Type Extraction
+    df['work_type'] = extracted['work_type']
+    df['employment_type'] = extracted['employment_type']
 
     return df
 
@@ -177,10 +298,23 @@ def parse_skills_for_gold(df, skill_cols):
     :return: Modified DataFrame with parsed columns
     """
     for col in skill_cols:
-        df[col] = df[col].fillna('').apply(lambda x: [s.strip() for s in x.split(';') if s.strip()])
+        values = df[col].fillna('').to_numpy(dtype=object)
+        parsed = [[s.strip() for s in x.split(';') if s.strip()] for x in values]
+        df[col] = pd.Series(parsed, index=df.index, dtype=object)
     return df
 
-def compute_clusters(df, skill_cols, n_clusters=5):
+def job_skill_lists(df, skill_cols):
+    """
+    Concatenates each job's skill list columns into one list per job.
+
+    :param df: Input DataFrame with jobs
+    :param skill_cols: List of columns with parsed skill lists
+    :return: Series of skill lists, indexed like df
+    """
+    columns = [df[col].to_numpy() for col in skill_cols]
+    return pd.Series([list(chain.from_iterable(row)) for row in zip(*columns)], index=df.index, dtype=object)
+
+def compute_clusters(df, skill_cols, n_clusters=5, all_skills=None):
     """
     Compute clusters based on binary skill features.
     Build binary skill matrix for top N skills and apply KMeans clustering.
@@ -189,15 +323,16 @@ def compute_clusters(df, skill_cols, n_clusters=5):
     :param df: Input DataFrame with jobs
     :param skill_cols: List of columns with semicolon-separated skill lists
     :param n_clusters: Number of clusters to compute (default: 5)
+    :param all_skills: Output of job_skill_lists for df, if already computed
     :return: Modified DataFrame with cluster assignments and list of top skills
     """
-    all_skills = df[skill_cols].apply(lambda row: sum(row, []), axis=1)
-    flat_skills = [skill for sublist in all_skills for skill in sublist if skill]
+    if all_skills is None:
+        all_skills = job_skill_lists(df, skill_cols)
+    flat_skills = [skill for skill in chain.from_iterable(all_skills) if skill]
     top_n = 50
     top_skills = [s for s, _ in Counter(flat_skills).most_common(top_n)]
-    for skill in top_skills:
-        df[f'skill_{skill}'] = all_skills.apply(lambda skills: int(skill in skills))
-    skill_matrix = df[[f'skill_{skill}' for skill in top_skills]].values
+    # Binary job x top-skill matrix in one pass (skills outside the top N are ignored)
+    skill_matrix = MultiLabelBinarizer(classes=top_skills).fit_transform(all_skills)
     kmeans = KMeans(n_clusters=n_clusters, random_state=42)
     clusters = kmeans.fit_predict(skill_matrix)
     df['cluster'] = clusters
@@ -211,28 +346,114 @@ def compute_clusters(df, skill_cols, n_clusters=5):
     df['cluster_name'] = df['cluster'].map(cluster_names)
     return df, top_skills
 
-def explode_job_skills(df, skill_cols):
+def explode_job_skills(df, skill_cols, long=None):
     """
     Explode job skills into separate rows.
 
     :param df: Input DataFrame with jobs
     :param skill_cols: List of columns with semicolon-separated skill lists
+    :param long: Output of skills_long for df, if already computed
     :return: DataFrame with exploded job skills
     """
-    job_skills = []
-    for idx, row in df.iterrows():
-        job_id = row['id']
-        for col in skill_cols:
-            for skill in row[col]:
-                if skill:
-                    job_skills.append({
-                        'job_id': job_id,
-                        'skill': skill,
-                        'skill_category': col
-                    })
-    return pd.DataFrame(job_skills)
-
-def build_gold_tables(df, skill_cols, gold_dir):
+    if long is None:
+        long = skills_long(df, skill_cols)
+    return pd.DataFrame({
+        'job_id': df.loc[long.index, 'id'].to_numpy(),
+        'skill': long['skill'].to_numpy(),
+        'skill_category': long['skill_category'].to_numpy(),
+    })
+
+def skills_long(df, skill_cols):
+    """
+    Reshapes the skill list columns into one row per (job, skill category, skill),
+    keeping the job's index in df so other job columns can be joined back.
+
+    :param df: Input DataFrame with jobs
+    :param skill_cols: List of columns with parsed skill lists
+    :return: DataFrame with 'skill_category' and 'skill' columns, indexed like df
+    """
+    long = df[skill_cols].melt(var_name='skill_category', value_name='skill', ignore_index=False)
+    # Row-major order (job by job, categories in skill_cols order), as the old loops produced
+    long = long.sort_index(kind='stable').explode('skill')
+    return long[long['skill'].notna() & (long['skill'] != '')]
+
+def count_skills_by(long, df, col):
+    """
+    Counts skill mentions per value of a job column (e.g. country).
+
+    :param long: Output of skills_long for df
+    :param df: Input DataFrame with jobs
+    :param col: Job column to group by
+    :return: DataFrame with columns col, 'skill' and 'count'
+    """
+    # Categorical job columns are grouped on their integer codes
+    keys = df.loc[long.index, col].to_numpy()
+    counts = pd.DataFrame({col: keys, 'skill': long['skill'].to_numpy()})
+    counts = counts.groupby([col, 'skill'], sort=False, dropna=False, observed=True).size().reset_index(name='count')
+    counts[col] = counts[col].astype(object)
+    return counts
+
+# Rows per Parquet row group in the gold files
+GOLD_ROW_GROUP_SIZE = 100_000
+
+def write_gold_parquet(df, path):
+    """
+    Writes a gold DataFrame with pyarrow (zstd, GOLD_ROW_GROUP_SIZE row groups).
+    Skill list columns are typed as lists of strings even when a batch has no
+    skills at all, which type inference would otherwise turn into list<null>.
+    """
+    table = pa.Table.from_pandas(df, preserve_index=False)
+    for col in SKILL_COLUMNS:
+        idx = table.schema.get_field_index(col)
+        if idx >= 0:
+            table = table.set_column(idx, col, table[col].cast(pa.list_(pa.string())))
+    pq.write_table(table, path, compression='zstd', row_group_size=GOLD_ROW_GROUP_SIZE)
+
+def append_and_dedupe(new_df, path, subset=None):
+    """
+    Appends new_df to existing Parquet file at path, deduplicating based on subset (if provided) or all columns (if not).
+    Rows of new_df win over existing rows with the same key; surviving rows keep their order.
+    The result has new_df's columns, so columns dropped from a gold table (e.g. the
+    old per-skill skill_<name> columns of job_postings) do not linger in the file.
+    If the file does not exist, simply writes the new_df to the Parquet file.
+    The merge runs in DuckDB, which streams the existing file instead of loading it into pandas.
+
+    :param new_df: DataFrame to append
+    :param path: Path to the Parquet file
+    :param subset: Optional list of columns to deduplicate on
+    """
+    if not path.exists():
+        write_gold_parquet(new_df, path)
+        return
+    new_path = path.with_suffix(".new" + path.suffix)
+    tmp_path = path.with_suffix(path.suffix + ".tmp")
+    write_gold_parquet(new_df, new_path)
+    columns = ", ".join(f'"{col}"' for col in new_df.columns)
+    keys = ", ".join(f'"{col}"' for col in (subset or new_df.columns))
+    # Order rows as pandas' concat would: existing file first, then new_df
+    position = f"filename = '{new_path.as_posix()}', file_row_number"
+    con = duckdb.connect()
+    try:
+        con.execute(f"""
+            COPY (
+                SELECT {columns}
+                FROM read_parquet(
+                    ['{path.as_posix()}', '{new_path.as_posix()}'],
+                    union_by_name = true, filename = true, file_row_number = true
+                )
+                QUALIFY row_number() OVER (
+                    PARTITION BY {keys}
+                    ORDER BY filename = '{new_path.as_posix()}' DESC, file_row_number DESC
+                ) = 1
+                ORDER BY {position}
+            ) TO '{tmp_path.as_posix()}' (FORMAT PARQUET, COMPRESSION ZSTD, ROW_GROUP_SIZE {GOLD_ROW_GROUP_SIZE})
+        """)
+    finally:
+        con.close()
+        new_path.unlink()
+    os.replace(tmp_path, path)
+
+def build_gold_tables(df, skill_cols, gold_dir, all_skills=None):
     """
     Builds the gold layer tables from the input DataFrame.
 
@@ -249,38 +470,22 @@ def build_gold_tables(df, skill_cols, gold_dir):
     :param df: Input DataFrame with job postings
     :param skill_cols: List of columns with semicolon-separated skill lists
     :param gold_dir: Directory where the gold layer tables will be saved
+    :param all_skills: Output of job_skill_lists for df, if already computed
     """
     gold_dir.mkdir(parents=True, exist_ok=True)
-    # Helper to append and deduplicate
-    def append_and_dedupe(new_df, path, subset=None):
-        """
-        Appends new_df to existing Parquet file at path, deduplicating based on subset (if provided) or all columns (if not).
-        If the file does not exist, simply writes the new_df to the Parquet file.
-        :param new_df: DataFrame to append
-        :param path: Path to the Parquet file
-        :param subset: Optional list of columns to deduplicate on
-        """
-        if path.exists():
-            old_df = pd.read_parquet(path)
-            combined = pd.concat([old_df, new_df], ignore_index=True)
-            if subset:
-                combined = combined.drop_duplicates(subset=subset, keep="last")
-            else:
-                combined = combined.drop_duplicates(keep="last")
-        else:
-            combined = new_df
-        combined.to_parquet(path, index=False)
+    if all_skills is None:
+        all_skills = job_skill_lists(df, skill_cols)
     # 1. job_postings.parquet (dedupe by 'id')
     append_and_dedupe(df, gold_dir / 'job_postings.parquet', subset=['id'])
     # 2. skills.parquet (dedupe by 'skill')
-    all_skills = [skill for sublist in df[skill_cols].apply(lambda row: sum(row, []), axis=1) for skill in sublist if skill]
-    skill_counts = Counter(all_skills)
+    skill_counts = Counter(skill for skill in chain.from_iterable(all_skills) if skill)
     skills_df = pd.DataFrame([
         {'skill': s, 'frequency': c} for s, c in skill_counts.items()
     ])
     append_and_dedupe(skills_df, gold_dir / 'skills.parquet', subset=['skill'])
     # 3. job_skills.parquet (dedupe by job_id+skill+skill_category)
-    job_skills_df = explode_job_skills(df, skill_cols)
+    long = skills_long(df, skill_cols)
+    job_skills_df = explode_job_skills(df, skill_cols, long)
     append_and_dedupe(job_skills_df, gold_dir / 'job_skills.parquet', subset=['job_id', 'skill', 'skill_category'])
     # 4. companies.parquet (dedupe by company)
     companies = df.groupby('company').agg(
@@ -290,54 +495,96 @@ def build_gold_tables(df, skill_cols, gold_dir):
     ).reset_index()
     append_and_dedupe(companies, gold_dir / 'companies.parquet', subset=['company'])
     # 5. country_skill_counts.parquet (dedupe by country+skill)
-    country_skill = defaultdict(lambda: defaultdict(int))
-    for _, row in df.iterrows():
-        country = row['country']
-        for col in skill_cols:
-            for skill in row[col]:
-                if skill:
-                    country_skill[country][skill] += 1
-    rows = []
-    for country, skills in country_skill.items():
-        for skill, count in skills.items():
-            rows.append({'country': country, 'skill': skill, 'count': count})
-    country_skill_df = pd.DataFrame(rows)
+    country_skill_df = count_skills_by(long, df, 'country')
     append_and_dedupe(country_skill_df, gold_dir / 'country_skill_counts.parquet', subset=['country', 'skill'])
     # 6. experience_skill_counts.parquet (dedupe by experience_level+skill)
-    exp_skill = defaultdict(lambda: defaultdict(int))
-    for _, row in df.iterrows():
-        exp = row['experience_level']
-        for col in skill_cols:
-            for skill in row[col]:
-                if skill:
-                    exp_skill[exp][skill] += 1
-    rows = []
-    for exp, skills in exp_skill.items():
-        for skill, count in skills.items():
-            rows.append({'experience_level': exp, 'skill': skill, 'count': count})
-    exp_skill_df = pd.DataFrame(rows)
+    exp_skill_df = count_skills_by(long, df, 'experience_level')
     append_and_dedupe(exp_skill_df, gold_dir / 'experience_skill_counts.parquet', subset=['experience_level', 'skill'])
     # 7. salary_skill_stats.parquet (dedupe by skill)
-    skill_salary = []
-    all_skills_series = df[skill_cols].apply(lambda row: sum(row, []), axis=1)
-    for skill in skill_counts:
-        mask = all_skills_series.apply(lambda skills: skill in skills)
-        salaries = df.loc[mask, 'avg_salary_annual_usd'].dropna()
-        if len(salaries) > 0:
-            skill_salary.append({
-                'skill': skill,
-                'p25': np.percentile(salaries, 25),
-                'median': np.percentile(salaries, 50),
-                'p75': np.percentile(salaries, 75),
-                'count': len(salaries)
-            })
-    skill_salary_df = pd.DataFrame(skill_salary)
+    # One row per (job, skill), as a job listing a skill under two categories counts once
+    job_skill = pd.DataFrame({'job': long.index, 'skill': long['skill'].to_numpy()}).drop_duplicates()
+    job_skill['salary'] = df.loc[job_skill['job'], 'avg_salary_annual_usd'].to_numpy()
+    # Groups in order of the skills' first mention (as in skills.parquet)
+    by_skill = job_skill.groupby('skill', sort=False)['salary']
+    salary_counts = by_skill.count()
+    quantiles = by_skill.quantile([0.25, 0.5, 0.75]).unstack().reindex(salary_counts.index)
+    skill_salary_df = pd.DataFrame({
+        'skill': salary_counts.index,
+        'p25': quantiles[0.25].to_numpy(),
+        'median': quantiles[0.5].to_numpy(),
+        'p75': quantiles[0.75].to_numpy(),
+        'count': salary_counts.to_numpy(),
+    })
+    skill_salary_df = skill_salary_df[skill_salary_df['count'] > 0].reset_index(drop=True)
     append_and_dedupe(skill_salary_df, gold_dir / 'salary_skill_stats.parquet', subset=['skill'])
 
+# Dashboard aggregates and lookup tables, rebuilt in MotherDuck from the loaded
+# gold tables so the dashboard reads a few small tables instead of scanning them
+GOLD_AGGREGATES = {
+    "archetype_job_counts": """
+        SELECT cluster_name, COUNT(*) AS job_count, AVG(avg_salary_annual_usd) AS avg_salary
+        FROM job_postings
+        GROUP BY ALL
+    """,
+    "date_job_counts": """
+        SELECT date_posted, COUNT(*) AS job_count,
+            AVG(avg_salary_annual_usd) FILTER (WHERE avg_salary_annual_usd > 0) AS avg_salary
+        FROM job_postings
+        GROUP BY ALL
+    """,
+    # country_iso is registered by materialize_gold_aggregates
+    "country_job_counts": """
+        SELECT country, iso3, COUNT(*) AS job_count
+        FROM job_postings
+        LEFT JOIN country_iso USING (country)
+        GROUP BY ALL
+    """,
+    "dim_company": """
+        SELECT DISTINCT company
+        FROM companies
+        WHERE company IS NOT NULL
+    """,
+    "dim_skill": """
+        SELECT DISTINCT skill
+        FROM skills
+        WHERE skill IS NOT NULL AND skill <> ''
+    """,
+    "dim_work_type": """
+        SELECT DISTINCT work_type
+        FROM job_postings
+        WHERE work_type IS NOT NULL
+    """,
+    "dim_employment_type": """
+        SELECT DISTINCT employment_type
+        FROM job_postings
+        WHERE employment_type IS NOT NULL
+    """,
+}
+
+def materialize_gold_aggregates(con):
+    """
+    Creates or replaces the dashboard aggregate tables defined in GOLD_AGGREGATES.
+
+    :param con: DuckDB/MotherDuck connection where the gold tables are loaded
+    """
+    # Resolve ISO-3 codes once per distinct country, for the dashboard's choropleth
+    country_iso = con.execute(
+        "SELECT DISTINCT country FROM job_postings WHERE country IS NOT NULL"
+    ).fetchdf()
+    country_iso['iso3'] = cc.pandas_convert(country_iso['country'], to='ISO3').replace('not found', None)
+    con.register('country_iso', country_iso)
+    for tbl, sql in GOLD_AGGREGATES.items():
+        con.execute(f"CREATE OR REPLACE TABLE {tbl} AS {sql}")
+        print(f"Materialized aggregate table: {tbl}")
+    con.unregister('country_iso')
+
 def load_gold_to_motherduck(db_name="data_career_navigator"):
     """
     Loads all gold-layer Parquet files in data/gold/ into MotherDuck, appending to existing tables.
-    Uses CREATE TABLE IF NOT EXISTS and INSERT INTO for append-only workflow.
+    Uses CREATE TABLE IF NOT EXISTS and INSERT INTO for append-only workflow,
+    then rebuilds the dashboard aggregate and lookup tables from the updated gold tables.
+    Everything runs in one transaction, so MotherDuck commits once for the whole
+    load and a failed run leaves the previous tables untouched.
     Requires MOTHERDUCK_TOKEN in environment.
     """
     gold_dir = Path("data/gold")
@@ -356,8 +603,34 @@ def load_gold_to_motherduck(db_name="data_career_navigator"):
     if not token:
         raise RuntimeError("MOTHERDUCK_TOKEN environment variable not set.")
     con = duckdb.connect(f"md:{db_name}")
+    # Row order of the loaded tables does not matter, so let DuckDB stream the
+    # Parquet inserts in parallel without buffering to keep the input order
+    con.execute("SET preserve_insertion_order = false")
+    con.execute("BEGIN TRANSACTION")
+    try:
+        load_gold_tables(con, gold_dir, parquet_files, table_names)
+        materialize_gold_aggregates(con)
+        con.execute("COMMIT")
+    except Exception:
+        con.execute("ROLLBACK")
+        raise
+    finally:
+        con.close()
+    print(f"✅ All gold-layer tables loaded/appended to MotherDuck database: {db_name}")
+
+def load_gold_tables(con, gold_dir, parquet_files, table_names):
+    """
+    Appends each gold Parquet file to its table, creating the table if needed.
+
+    :param con: DuckDB/MotherDuck connection (inside the caller's transaction)
+    :param gold_dir: Directory with the gold Parquet files
+    :param parquet_files: Parquet file names in gold_dir
+    :param table_names: Target table name for each file
+    """
     for fname, tbl in zip(parquet_files, table_names):
-        parquet_path = gold_dir / fname
+        # Read each file once; DuckDB scans the registered Arrow table in place
+        # for both the schema probe and the insert
+        con.register('gold_src', pq.read_table(gold_dir / fname))
         if tbl == 'job_postings':
             # Explicitly cast date_posted as DATE
             select_cols = """
@@ -365,63 +638,109 @@ def load_gold_to_motherduck(db_name="data_career_navigator"):
                 CAST(date_posted AS DATE) AS date_posted,
                 work_type, employment_type, description, header_text, has_salary, currency_raw, min_salary_raw, max_salary_raw, single_salary_raw, salary_period, min_salary_annual_usd, max_salary_annual_usd, avg_salary_annual_usd, salary_confidence, experience_level, programming_languages, libraries, analyst_tools, cloud_platforms, country, cluster, cluster_name
             """
-            create_sql = f"CREATE TABLE IF NOT EXISTS {tbl} AS SELECT {select_cols} FROM read_parquet('{parquet_path.as_posix()}') WHERE FALSE;"
-            insert_sql = f"INSERT INTO {tbl} SELECT {select_cols} FROM read_parquet('{parquet_path.as_posix()}');"
         else:
-            create_sql = f"CREATE TABLE IF NOT EXISTS {tbl} AS SELECT * FROM read_parquet('{parquet_path.as_posix()}') WHERE FALSE;"
-            insert_sql = f"INSERT INTO {tbl} SELECT * FROM read_parquet('{parquet_path.as_posix()}');"
-        con.execute(create_sql)
-        con.execute(insert_sql)
+            select_cols = "*"
+        con.execute(f"CREATE TABLE IF NOT EXISTS {tbl} AS SELECT {select_cols} FROM gold_src WHERE FALSE;")
+        con.execute(f"INSERT INTO {tbl} SELECT {select_cols} FROM gold_src;")
+        con.unregister('gold_src')
         print(f"Appended {fname} to MotherDuck table: {tbl}")
-    print(f"✅ All gold-layer tables loaded/appended to MotherDuck database: {db_name}")
 
-def main():
+def file_digest(path, block_size=1 << 20):
+    """
+    Returns the SHA-256 hex digest of a file, read in 1 MiB blocks.
+    """
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for block in iter(lambda: f.read(block_size), b""):
+            digest.update(block)
+    return digest.hexdigest()
+
+def main(force=False):
     """
     Main ETL routine:
-    1. Reads input CSV, enriches job postings with extracted features, and saves to output CSV.
-    2. Parses skills for gold layer, computes clusters, and builds gold tables.
+    1. Streams the input CSV in chunks, enriches job postings with extracted features, and appends them to output Parquet.
+    2. Computes clusters and builds gold tables from the enriched chunks kept in memory.
     3. If run with "load_motherduck" argument, loads gold tables into MotherDuck database.
-    4. Saves enriched dataset to data/silver/enriched_jobs.csv.
+    4. Saves enriched dataset to data/silver/enriched_jobs.parquet.
     5. If run as a script, executes the ETL pipeline.
+
+    The run is skipped when the bronze input is byte-for-byte the one the silver
+    output was built from; pass force=True (or "--force") to rebuild anyway,
+    e.g. after changing the extractors.
     """
     if not INPUT_PATH.exists():
         raise FileNotFoundError(f"Input file not found: {INPUT_PATH}")
 
-    # Load input data
-    df = pd.read_csv(INPUT_PATH)
-
-    # Remove rows where all key columns (location, company) are obfuscated
-    df = drop_obfuscated_rows(df, key_cols=['location', 'company'])
-
-    # Extract country from 'location' column if present
-    if 'location' in df.columns:
-        print(f"Extracting country from location column for {len(df)} rows. This may take a while if geocoding is needed...")
-        df['country'] = df['location'].apply(extract_country)
-    else:
-        df['country'] = 'Unknown'
+    # Skip the whole local ETL if the bronze input has not changed since the last run
+    input_digest = file_digest(INPUT_PATH)
+    if not force and OUTPUT_PATH.exists() and INPUT_DIGEST_PATH.exists():
+        if INPUT_DIGEST_PATH.read_text().strip() == input_digest:
+            print(f"{INPUT_PATH} is unchanged since the last run. Skipping ETL (use --force to rerun).")
+            return
 
-    # Enrich data with features
-    enriched_df = enrich_job_postings(df)
+    skill_cols = SKILL_COLUMNS
 
     # Ensure output directory exists
     OUTPUT_PATH.parent.mkdir(parents=True, exist_ok=True)
-
-    # Save enriched dataset
-    enriched_df.to_csv(OUTPUT_PATH, index=False)
+    # Write to a temporary file first, so a failed run leaves the previous output intact
+    tmp_path = OUTPUT_PATH.with_suffix(OUTPUT_PATH.suffix + ".tmp")
+
+    # Stream the input through the enrichment chunk by chunk, appending each
+    # enriched chunk to the silver Parquet file. The bronze CSV and the
+    # enrichment intermediates are never held in memory as a whole; the typed
+    # silver tables and skill lists are kept for the gold step below, which
+    # needs the full table anyway, instead of reading the silver file back and
+    # re-splitting its skill strings
+    writer = None
+    silver_tables = []
+    skill_lists = {col: [] for col in skill_cols}
+    try:
+        for df in iter_bronze_csv(INPUT_PATH):
+            # Enrich data (dropping obfuscated rows and extracting the country
+            # from 'location' on the way) and append it to the silver file
+            enriched_df = enrich_job_postings(df)
+            if enriched_df.empty:
+                continue
+            if writer is None:
+                table = to_silver_table(enriched_df)
+                writer = pq.ParquetWriter(tmp_path, table.schema, compression='zstd')
+            else:
+                table = to_silver_table(enriched_df, writer.schema)
+            writer.write_table(table)
+            silver_tables.append(table)
+            for col in skill_cols:
+                skill_lists[col].extend(enriched_df[col])
+    finally:
+        if writer is not None:
+            writer.close()
+    if writer is None:
+        raise ValueError(f"No job postings left in {INPUT_PATH} after removing obfuscated rows")
+    os.replace(tmp_path, OUTPUT_PATH)
     print(f"✅ Enriched data saved to: {OUTPUT_PATH}")
 
     # --- Gold ETL Process ---
     gold_dir = Path('data/gold')
-    skill_cols = ['programming_languages', 'libraries', 'analyst_tools', 'cloud_platforms']
-    df = pd.read_csv(OUTPUT_PATH)
-    df = parse_skills_for_gold(df, skill_cols)
-    df, _ = compute_clusters(df, skill_cols)
-    build_gold_tables(df, skill_cols, gold_dir)
+    df = pa.concat_tables(silver_tables).to_pandas()
+    del silver_tables
+    # Skill columns as the lists extracted in memory (what parse_skills_for_gold
+    # would recover from the silver strings)
+    for col in skill_cols:
+        df[col] = pd.Series(skill_lists.pop(col), index=df.index, dtype=object)
+    # Few distinct countries: store as a categorical, so the gold aggregations
+    # group on integer codes (experience_level already is one)
+    df['country'] = df['country'].astype('category')
+    # Per-job skill lists, shared by the clustering and the gold tables
+    all_skills = job_skill_lists(df, skill_cols)
+    df, _ = compute_clusters(df, skill_cols, all_skills=all_skills)
+    build_gold_tables(df, skill_cols, gold_dir, all_skills=all_skills)
     print(f"✅ Gold-layer Parquet outputs saved to: {gold_dir}")
 
+    # Remember which bronze input the outputs were built from
+    INPUT_DIGEST_PATH.write_text(input_digest + "\n")
+
 # Run the ETL pipeline
 if __name__ == "__main__":
     if len(sys.argv) > 1 and sys.argv[1] == "load_motherduck":
         load_gold_to_motherduck()
     else:
-        main()
+        main(force="--force" in sys.argv[1:])
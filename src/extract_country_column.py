@@ -2,21 +2,30 @@
 Script: extract_country_column.py
 -------------------------------
 Extracts country from the 'location' column and adds it as a new column.
-Input: data/silver/enriched_jobs.csv
-Output: data/silver/enriched_jobs.csv
+Input: data/silver/enriched_jobs.parquet
+Output: data/silver/enriched_jobs.parquet
 Use this script only if the 'country' column is missing or needs to be updated.
 Otherwise, it's already handled in the main ETL pipeline.
+
+Only the 'location' column is read into pandas; DuckDB streams the other
+columns through to the output, so memory use does not grow with the width
+of the file.
 """
 
 # Import necessary libraries
+import os
 import time
 from pathlib import Path
+import duckdb
+import numpy as np
 import pandas as pd
-from extractors.location_extractor import extract_country
+import pyarrow as pa
+import pyarrow.parquet as pq
+from extractors.location_extractor import extract_countries
 
 # Define input/output paths
-INPUT_PATH = Path("data/silver/enriched_jobs.csv")
-OUTPUT_PATH = Path("data/silver/enriched_jobs.csv")
+INPUT_PATH = Path("data/silver/enriched_jobs.parquet")
+OUTPUT_PATH = Path("data/silver/enriched_jobs.parquet")
 
 # Set SAMPLE_SIZE to None to process all rows, or to an integer for a sample
 SAMPLE_SIZE = None  # e.g., 10 for testing
@@ -25,32 +34,51 @@ SAMPLE_SIZE = None  # e.g., 10 for testing
 if not INPUT_PATH.exists():
     raise FileNotFoundError(f"Input file not found: {INPUT_PATH}")
 
-# Read the input CSV file
-df = pd.read_csv(INPUT_PATH)
+# Read only the 'location' column; the other columns are never loaded
+columns = pq.read_schema(INPUT_PATH).names
+n_rows = pq.ParquetFile(INPUT_PATH).metadata.num_rows
 
 # Check if 'location' column exists
-# and drop rows where all key columns (location, company) are obfuscated
 # if not, add a 'country' column with 'Unknown' value
-if not 'location' in df.columns:
+if 'location' not in columns:
     print("No 'location' column found. Adding 'country' column with 'Unknown' value.")
-    df['country'] = 'Unknown'
-if 'location' in df.columns:
-    print(f"Extracting country from location column for {len(df)} rows. This may take a while if geocoding is needed...")
+    country = pd.Series(['Unknown'] * n_rows, dtype=object)
+else:
+    locations = pd.read_parquet(INPUT_PATH, columns=['location'])['location']
+    print(f"Extracting country from location column for {len(locations)} rows. This may take a while if geocoding is needed...")
     start = time.time()
     if SAMPLE_SIZE:
-        df_sample = df.head(SAMPLE_SIZE).copy()
-        df_sample['country'] = df_sample['location'].apply(extract_country)
-        print(df_sample[['location', 'country']])
+        sample = locations.head(SAMPLE_SIZE).to_frame()
+        sample['country'] = extract_countries(sample['location'])
+        print(sample[['location', 'country']])
         print(f"Sample extraction complete in {time.time() - start:.2f} seconds.")
         # Optionally, stop here for testing
         exit()
-    else:
-        df['country'] = df['location'].apply(extract_country)
-        print(f"Country extraction complete in {time.time() - start:.2f} seconds.")
-else:
-    df['country'] = 'Unknown'
+    # One extract_country call per distinct location (job boards repeat them a lot)
+    country = extract_countries(locations)
+    print(f"Country extraction complete in {time.time() - start:.2f} seconds.")
 
-# Ensure output directory exists and save the updated DataFrame
+# Ensure output directory exists
 OUTPUT_PATH.parent.mkdir(parents=True, exist_ok=True)
-df.to_csv(OUTPUT_PATH, index=False)
+# Replace (or append) only the country column; DuckDB streams the other columns
+# from the input file to the output as-is, without loading them into memory
+countries = pa.table({
+    'row_id': pa.array(np.arange(n_rows, dtype=np.int64)),
+    'country': pa.array(country.to_numpy(dtype=object), type=pa.string()),
+})
+con = duckdb.connect()
+con.register('countries', countries)
+select = "j.* EXCLUDE (file_row_number) REPLACE (c.country AS country)" if 'country' in columns else "j.* EXCLUDE (file_row_number), c.country"
+# Write to a temporary file first, since input and output may be the same file
+tmp_path = OUTPUT_PATH.with_suffix(OUTPUT_PATH.suffix + ".tmp")
+con.execute(f"""
+    COPY (
+        SELECT {select}
+        FROM read_parquet('{INPUT_PATH.as_posix()}', file_row_number = true) AS j
+        JOIN countries AS c ON c.row_id = j.file_row_number
+        ORDER BY j.file_row_number
+    ) TO '{tmp_path.as_posix()}' (FORMAT PARQUET, COMPRESSION ZSTD)
+""")
+con.close()
+os.replace(tmp_path, OUTPUT_PATH)
 print(f"✅ Data with country column saved to: {OUTPUT_PATH}")
@@ -4,7 +4,23 @@ This module contains a function to categorize job experience levels based on job
 
 # Import necessary libraries
 import re
+from functools import lru_cache
 
+# Every value categorize_experience can return
+EXPERIENCE_LEVELS = ['Entry-Level', 'Mid-Level', 'Senior', 'Not Specified']
+
+# Title keywords per level, checked in this order (built once at import)
+SENIOR_KEYWORDS = ("senior", "sr", "lead", "principal", "manager", "staff", "head of")
+MID_KEYWORDS = ("mid-level", "intermediate", "specialist")
+ENTRY_KEYWORDS = ("junior", "jr", "entry-level", "graduate", "intern", "trainee")
+
+# Description patterns, compiled once at import
+RANGE_PATTERN = re.compile(r"(\d+)\s*[–\-]\s*(\d+)\s*(?:years?|yrs?)")
+SINGLE_PATTERN = re.compile(r"(\d+)\+?\s*(?:years?|yrs?)")
+
+# Reposted jobs repeat the same (title, description) pair, also across the ETL's
+# streamed chunks. The cache holds references to the texts, so it is bounded.
+@lru_cache(maxsize=10_000)
 def categorize_experience(title: str, description: str) -> str:
     """
     Given a job title (from 'title' column) and job description (from 'description' column), return one of:
@@ -40,27 +56,23 @@ def categorize_experience(title: str, description: str) -> str:
     desc_lower = description.lower()
 
     # 1. Title-based rules
-    senior_keywords = ["senior", "sr", "lead", "principal", "manager", "staff", "head of"]
-    for kw in senior_keywords:
+    for kw in SENIOR_KEYWORDS:
         if kw in title_lower:
             return "Senior"
 
     if "associate" in title_lower:
         return "Entry-Level"
 
-    mid_keywords = ["mid-level", "intermediate", "specialist"]
-    for kw in mid_keywords:
+    for kw in MID_KEYWORDS:
         if kw in title_lower:
             return "Mid-Level"
 
-    entry_keywords = ["junior", "jr", "entry-level", "graduate", "intern", "trainee"]
-    for kw in entry_keywords:
+    for kw in ENTRY_KEYWORDS:
         if kw in title_lower:
             return "Entry-Level"
 
     # 2a. Year-range pattern (e.g. "3–5 years" or "3-5 years")
-    range_pattern = re.compile(r"(\\d+)\\s*[–\\-]\\s*(\\d+)\\s*(?:years?|yrs?)")
-    match_range = range_pattern.search(desc_lower)
+    match_range = RANGE_PATTERN.search(desc_lower)
     if match_range:
         low = int(match_range.group(1))
         high = int(match_range.group(2))
@@ -71,8 +83,7 @@ def categorize_experience(title: str, description: str) -> str:
         return "Mid-Level"
 
     # 2b. Single-year pattern (e.g. "3+ years" or "4 years")
-    single_pattern = re.compile(r"(\\d+)\\+?\\s*(?:years?|yrs?)")
-    match_single = single_pattern.search(desc_lower)
+    match_single = SINGLE_PATTERN.search(desc_lower)
     if match_single:
         years = int(match_single.group(1))
         if years <= 2:
@@ -3,16 +3,36 @@ File: src/extractors/job_type_extractor.py
 This module provides functions to extract work type and employment type from job titles and descriptions.
 """
 
-# Import necessary library
+# Import necessary libraries
 import re
+from functools import lru_cache
+
+# Every value extract_work_type / extract_employment_type can return
+WORK_TYPES = ['Remote', 'Hybrid', 'On-site', 'Not Specified']
+EMPLOYMENT_TYPES = ['Full-time', 'Part-time', 'Contract', 'Temporary', 'Internship', 'Freelance', 'Not Specified']
+
+# Fallback patterns, compiled once at import
+REMOTE_PATTERN = re.compile(r'\b(remote|work from home|wfh)\b')
+HYBRID_PATTERN = re.compile(r'\b(hybrid|flexible location|partially remote)\b')
+ONSITE_PATTERN = re.compile(r'\b(on[- ]?site|on site|office-based)\b')
+FULL_TIME_PATTERN = re.compile(r'\b(full[- ]?time|permanent)\b')
+PART_TIME_PATTERN = re.compile(r'\b(part[- ]?time)\b')
 
 def extract_work_type(title: str, description: str) -> str:
     """
     Extracts the work type from the job title and description.
     Possible return values: 'Remote', 'Hybrid', 'On-site', 'Not Specified'
     """
-    text = f"{title} {description}".lower()
+    return work_type_from_text(f"{title} {description}".lower())
 
+# Reposted jobs repeat the same texts, also across the ETL's streamed chunks.
+# The caches hold references to the texts, so they are bounded.
+@lru_cache(maxsize=10_000)
+def work_type_from_text(text: str) -> str:
+    """
+    extract_work_type on an already lowercased "title description" text, so
+    callers extracting several features can lowercase it once.
+    """
     # Check for explicit keywords in header_text style (semicolon or line separated)
     # Accepts: 'Remote', 'Hybrid', 'On-site', 'On site', etc.
     if 'remote' in text:
@@ -21,12 +41,14 @@ def extract_work_type(title: str, description: str) -> str:
         return 'Hybrid'
     elif 'on-site' in text or 'on site' in text or 'office-based' in text:
         return 'On-site'
-    # Fallback to regex for more flexible matching
-    elif re.search(r'\b(remote|work from home|wfh)\b', text):
+    # Fallback to regex for more flexible matching. Given the keyword checks
+    # above failed, a pattern can only match text containing the substrings
+    # tested before it, so the (slower) regex search is skipped otherwise
+    elif ('work from home' in text or 'wfh' in text) and REMOTE_PATTERN.search(text):
         return 'Remote'
-    elif re.search(r'\b(hybrid|flexible location|partially remote)\b', text):
+    elif 'flexible location' in text and HYBRID_PATTERN.search(text):
         return 'Hybrid'
-    elif re.search(r'\b(on[- ]?site|on site|office-based)\b', text):
+    elif 'onsite' in text and ONSITE_PATTERN.search(text):
         return 'On-site'
     else:
         return 'Not Specified'
@@ -36,8 +58,13 @@ def extract_employment_type(title: str, description: str) -> str:
     Extracts the employment type from the job title and description.
     Possible return values: 'Full-time', 'Part-time', 'Contract', 'Temporary', 'Internship', 'Freelance', 'Not Specified'
     """
-    text = f"{title} {description}".lower()
+    return employment_type_from_text(f"{title} {description}".lower())
 
+@lru_cache(maxsize=10_000)
+def employment_type_from_text(text: str) -> str:
+    """
+    extract_employment_type on an already lowercased "title description" text.
+    """
     # Check for explicit keywords in header_text style (semicolon or line separated)
     # Accepts: 'Full-time', 'Part-time', 'Contract', etc.
     if 'full-time' in text or 'full time' in text or 'permanent' in text:
@@ -52,18 +79,14 @@ def extract_employment_type(title: str, description: str) -> str:
         return 'Internship'
     elif 'freelance' in text or 'freelancer' in text:
         return 'Freelance'
-    # Fallback to regex for more flexible matching
-    elif re.search(r'\b(full[- ]?time|permanent)\b', text):
+    # Fallback to regex for more flexible matching. Given the keyword checks
+    # above failed, only 'fulltime' and 'parttime' can still match, so the
+    # (slower) regex search is skipped for text without them. The contract,
+    # temporary, internship and freelance patterns need substrings already
+    # checked above, so they can never match here and are not tried
+    elif 'fulltime' in text and FULL_TIME_PATTERN.search(text):
         return 'Full-time'
-    elif re.search(r'\b(part[- ]?time)\b', text):
+    elif 'parttime' in text and PART_TIME_PATTERN.search(text):
         return 'Part-time'
-    elif re.search(r'\b(contract|contractor)\b', text):
-        return 'Contract'
-    elif re.search(r'\b(temporary|temp)\b', text):
-        return 'Temporary'
-    elif re.search(r'\b(internship|intern)\b', text):
-        return 'Internship'
-    elif re.search(r'\b(freelance|freelancer)\b', text):
-        return 'Freelance'
     else:
         return 'Not Specified'
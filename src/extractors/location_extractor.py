@@ -5,13 +5,28 @@ ETL pipeline to extract country from job postings based on location strings.
 """
 
 # Import necessary libraries
+import json
+import logging
+import os
 import re
+import threading
+from functools import lru_cache
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+import numpy as np
+import pandas as pd
 from country_converter import CountryConverter
 import pycountry
 from geopy.geocoders import Nominatim
 from geopy.extra.rate_limiter import RateLimiter
 
-# Initialize CountryConverter and geolocator with rate limiting
+# Per-location traces go to this logger at DEBUG level (off by default), as
+# extract_country runs for every distinct location
+logger = logging.getLogger(__name__)
+
+# Initialize CountryConverter and geolocator with rate limiting.
+# geopy's RateLimiter is thread-safe: concurrent callers still start at most
+# one request per min_delay_seconds, but their network round trips overlap.
 cc = CountryConverter()
 geolocator = Nominatim(user_agent="data-career-navigator-country-extractor")
 geocode = RateLimiter(
@@ -19,7 +34,9 @@ geocode = RateLimiter(
     min_delay_seconds=2,
     error_wait_seconds=5.0,
     max_retries=2,
-    swallow_exceptions=True
+    # Raise after the retries, so that extract_country can tell a failed
+    # request (not cached) from a lookup that found nothing (cached)
+    swallow_exceptions=False
 )
 
 # US state abbreviations
@@ -110,59 +127,208 @@ CITY_TO_COUNTRY.update({
     # Add more as needed
 })
 
-# Simple in-memory cache for geopy lookups
-_geocode_cache = {}
+# One pass over a location tells whether any CITY_TO_COUNTRY key occurs in it
+CITY_PATTERN = re.compile('|'.join(re.escape(city) for city in CITY_TO_COUNTRY))
+
+# pycountry names lowercased once: (name, lowercased name, lowercased official
+# name or None), in pycountry order, plus one pattern matching any of them
+PYCOUNTRY_NAMES = [
+    (
+        country_obj.name,
+        country_obj.name.lower(),
+        country_obj.official_name.lower() if hasattr(country_obj, 'official_name') else None,
+    )
+    for country_obj in pycountry.countries
+]
+PYCOUNTRY_PATTERN = re.compile('|'.join(
+    re.escape(name) for _, name_lower, official_lower in PYCOUNTRY_NAMES
+    for name in (name_lower, official_lower) if name is not None
+))
+
+# Offline gazetteer of states/provinces/regions from pycountry's ISO 3166-2
+# subdivisions: lowercased subdivision name -> ISO alpha-2 country code. Names
+# shared by several countries, or that are also country names (e.g. 'georgia'),
+# are left out so that they still go through geopy.
+_subdivision_countries = {}
+for _sub in pycountry.subdivisions:
+    _subdivision_countries.setdefault(_sub.name.lower(), set()).add(_sub.country_code)
+_country_names_lower = {name_lower for _, name_lower, _ in PYCOUNTRY_NAMES}
+SUBDIVISION_TO_COUNTRY = {
+    name: next(iter(codes))
+    for name, codes in _subdivision_countries.items()
+    if len(codes) == 1 and name not in _country_names_lower
+}
+# US state names, which (like US_STATE_ABBR) say the location is in the US
+US_STATE_NAMES = {sub.name.lower() for sub in pycountry.subdivisions.get(country_code='US')}
+
+@lru_cache(maxsize=None)
+def _country_short_name(alpha_2):
+    """Country name for an ISO alpha-2 code, in the short form the other lookups return."""
+    return cc.convert(names=alpha_2, src='ISO2', to='name_short', not_found=None)
+
+def _names_country_or_us_state(part):
+    """True if a location part is a country name or a US state (name or abbreviation)."""
+    if part in US_STATE_ABBR or part in US_STATE_NAMES or part in _country_names_lower:
+        return True
+    return cc.convert(names=part, to='name_short', not_found='not found') != 'not found'
+
+def _gazetteer_country(loc):
+    """
+    Country of a location from the offline subdivision gazetteer, or None.
+    Only used when the location has several parts and none of them names a
+    country or US state (geopy resolves those better, e.g. 'portland, me');
+    parts are scanned from last to first, as the region follows the city.
+    A lone name like 'kent' or 'victoria' is too ambiguous and is left to geopy.
+    """
+    parts = [part.strip() for part in loc.split(',') if part.strip()]
+    if len(parts) < 2 or not any(part in SUBDIVISION_TO_COUNTRY for part in parts):
+        return None
+    if any(_names_country_or_us_state(part) for part in parts):
+        return None
+    for part in reversed(parts):
+        if part in SUBDIVISION_TO_COUNTRY:
+            return _country_short_name(SUBDIVISION_TO_COUNTRY[part])
+    return None
+
+# Geopy lookups cached on disk, so reruns do not query Nominatim again for
+# locations already resolved ('Unknown' when geopy found no country; failed
+# requests are not cached)
+GEOCODE_CACHE_PATH = Path("data/cache/geocode_cache.json")
+
+def _load_geocode_cache():
+    try:
+        with open(GEOCODE_CACHE_PATH, "r", encoding="utf-8") as f:
+            return json.load(f)
+    except (FileNotFoundError, json.JSONDecodeError, OSError):
+        return {}
+
+# Threads resolving locations concurrently (see extract_countries)
+GEOCODE_WORKERS = 4
+_geocode_cache_lock = threading.Lock()
+
+def _cache_geocode_result(loc, country):
+    """Adds a geopy result to the cache and writes the cache file through."""
+    with _geocode_cache_lock:
+        _geocode_cache[loc] = country
+        try:
+            GEOCODE_CACHE_PATH.parent.mkdir(parents=True, exist_ok=True)
+            tmp_path = GEOCODE_CACHE_PATH.with_suffix(".json.tmp")
+            with open(tmp_path, "w", encoding="utf-8") as f:
+                json.dump(_geocode_cache, f, ensure_ascii=False, indent=0, sort_keys=True)
+            os.replace(tmp_path, GEOCODE_CACHE_PATH)
+        except OSError as e:
+            logger.warning("Could not write geocode cache %s: %s", GEOCODE_CACHE_PATH, e)
+
+_geocode_cache = _load_geocode_cache()
 
 def extract_country(location_str):
     if not location_str or not isinstance(location_str, str):
-        print(f"[extract_country] Empty or invalid location: {location_str}")
+        logger.debug("Empty or invalid location: %s", location_str)
         return 'Unknown'
     loc = location_str.strip().lower()
-    print(f"[extract_country] Processing: '{location_str}' -> '{loc}'")
+    logger.debug("Processing: '%s' -> '%s'", location_str, loc)
     # Remove common suffixes like 'metropolitan area', 'metroplex', 'metro', 'region', 'area', 'county', 'greater'
     loc = re.sub(r'\b(metropolitan area|metroplex|metro|region|area|county|greater)\b', '', loc, flags=re.IGNORECASE)
     loc = re.sub(r'\s+', ' ', loc).strip(' ,')
-    # Try city/region mapping first
-    for city in CITY_TO_COUNTRY:
+    # Try city/region mapping first (the first key in dict order wins, so the
+    # scan only runs once the combined pattern found some key in loc)
+    for city in (CITY_TO_COUNTRY if CITY_PATTERN.search(loc) else ()):
         if city in loc:
-            print(f"[extract_country] Matched city/region mapping: '{city}' -> '{CITY_TO_COUNTRY[city]}'")
+            logger.debug("Matched city/region mapping: '%s' -> '%s'", city, CITY_TO_COUNTRY[city])
             return CITY_TO_COUNTRY[city]
-    # Try cached geopy lookup
-    if loc in _geocode_cache:
-        print(f"[extract_country] Cache hit for '{loc}': {_geocode_cache[loc]}")
-        return _geocode_cache[loc]
-    # Try geopy first for any city/state/country string
-    try:
-        geo = geocode(loc, addressdetails=True, language='en', timeout=10)
-        if geo and geo.raw and 'address' in geo.raw:
-            address = geo.raw['address']
-            if 'country' in address:
-                print(f"[extract_country] Geopy found: '{loc}' -> '{address['country']}'")
-                _geocode_cache[loc] = address['country']
-                return address['country']
-    except Exception as e:
-        print(f"[extract_country] Geopy error for '{loc}': {e}")
-    _geocode_cache[loc] = 'Unknown'
+    # Try cached geopy lookup. A cached 'Unknown' means geopy found no country
+    # for loc before: skip geopy, but still try the fallbacks below
+    cached = _geocode_cache.get(loc)
+    if cached is not None and cached != 'Unknown':
+        logger.debug("Cache hit for '%s': %s", loc, cached)
+        return cached
+    # Try the offline gazetteer, so only locations it cannot resolve pay for a
+    # rate-limited geopy request
+    country = _gazetteer_country(loc)
+    if country:
+        logger.debug("Gazetteer match: '%s' -> '%s'", loc, country)
+        return country
+    # Try geopy for any other city/state/country string
+    if cached is None:
+        try:
+            geo = geocode(loc, addressdetails=True, language='en', timeout=10)
+        except Exception as e:
+            # Timeouts, rate limiting or network errors are not cached, so the
+            # next run geocodes loc again
+            logger.warning("Geopy error for '%s': %s", loc, e)
+        else:
+            if geo and geo.raw and 'address' in geo.raw and 'country' in geo.raw['address']:
+                country = geo.raw['address']['country']
+                logger.debug("Geopy found: '%s' -> '%s'", loc, country)
+                _cache_geocode_result(loc, country)
+                return country
+            # Geopy answered, without a country: remember the negative lookup
+            _cache_geocode_result(loc, 'Unknown')
     # Try last part (e.g., state or country)
     parts = [p.strip() for p in re.split(r',', loc)]
     if parts:
         last = parts[-1]
         country = cc.convert(names=last, to='name_short', not_found=None)
         if country and country != 'not found':
-            print(f"[extract_country] CountryConverter last part: '{last}' -> '{country}'")
+            logger.debug("CountryConverter last part: '%s' -> '%s'", last, country)
             return country
     # Try direct country match for the whole string
     country = cc.convert(names=loc, to='name_short', not_found=None)
     if country and country != 'not found':
-        print(f"[extract_country] CountryConverter full: '{loc}' -> '{country}'")
+        logger.debug("CountryConverter full: '%s' -> '%s'", loc, country)
         return country
-    # Try fuzzy matching with pycountry
-    for country_obj in pycountry.countries:
-        if country_obj.name.lower() in loc:
-            print(f"[extract_country] PyCountry fuzzy: '{loc}' -> '{country_obj.name}'")
-            return country_obj.name
-        if hasattr(country_obj, 'official_name') and country_obj.official_name.lower() in loc:
-            print(f"[extract_country] PyCountry fuzzy official: '{loc}' -> '{country_obj.name}'")
-            return country_obj.name
-    print(f"[extract_country] No match for '{loc}', returning 'Unknown'")
-    return 'Unknown'
\ No newline at end of file
+    # Try fuzzy matching with pycountry (the scan only runs once the combined
+    # pattern found some name in loc; the first country in pycountry order wins)
+    for name, name_lower, official_lower in (PYCOUNTRY_NAMES if PYCOUNTRY_PATTERN.search(loc) else ()):
+        if name_lower in loc:
+            logger.debug("PyCountry fuzzy: '%s' -> '%s'", loc, name)
+            return name
+        if official_lower is not None and official_lower in loc:
+            logger.debug("PyCountry fuzzy official: '%s' -> '%s'", loc, name)
+            return name
+    logger.debug("No match for '%s', returning 'Unknown'", loc)
+    return 'Unknown'
+
+def extract_countries(locations):
+    """
+    Maps a Series of location strings to country names, calling extract_country
+    (which may geocode) once per distinct location instead of once per row.
+    The distinct locations are resolved by GEOCODE_WORKERS threads, so geocoding
+    requests overlap within the rate limit. Missing locations map to 'Unknown'.
+    """
+    codes, uniques = pd.factorize(locations)
+    print(f"Extracting country for {len(uniques)} distinct locations ({len(locations)} rows). This may take a while if geocoding is needed...")
+    with ThreadPoolExecutor(max_workers=GEOCODE_WORKERS) as pool:
+        resolved = list(pool.map(extract_country, uniques))
+    # Index -1 (missing location) picks the trailing 'Unknown'
+    countries = np.array(resolved + ['Unknown'], dtype=object)
+    return pd.Series(countries[codes], index=locations.index)
+
+# Locations the offline gazetteer must leave to geopy (None), or resolve to the
+# same short country names as the other lookups
+GAZETTEER_CASES = {
+    'portland, me': None,
+    'lincolnshire, il': None,
+    'santiago, santiago metropolitan, chile': None,
+    'kent': None,
+    'norfolk': None,
+    'essex': None,
+    'victoria': None,
+    'hamilton, ontario': 'Canada',
+    'zhongli, taoyuan': 'Taiwan',
+}
+
+def test_gazetteer():
+    """
+    Checks _gazetteer_country on GAZETTEER_CASES (locations as extract_country
+    passes them: lowercased, with suffixes like 'region' removed)
+    """
+    for loc, expected in GAZETTEER_CASES.items():
+        country = _gazetteer_country(loc)
+        assert country == expected, f"{loc!r}: expected {expected!r}, got {country!r}"
+    print(f"Gazetteer check passed for {len(GAZETTEER_CASES)} locations")
+
+# Run the gazetteer check
+# Not necessary to run in production, but useful for debugging
+if __name__ == "__main__":
+    test_gazetteer()
@@ -7,8 +7,11 @@ Utility to detect and filter out rows where all columns except 'link' are obfusc
 
 # Import necessary libraries
 import re
+import numpy as np
 import pandas as pd
 
+# ASCII letters and digits: a value without any of them is obfuscated
+ALNUM_PATTERN = re.compile(r'[a-zA-Z0-9]')
 
 def is_obfuscated(val):
     """
@@ -20,9 +23,18 @@ def is_obfuscated(val):
         return True
     if not isinstance(val, str):
         return False
-    # Remove whitespace and common obfuscation chars
-    cleaned = re.sub(r'[^a-zA-Z0-9]', '', val)
-    return cleaned == ''
+    # Stops at the first ASCII letter or digit instead of building a cleaned copy
+    return ALNUM_PATTERN.search(val) is None
+
+def obfuscated_mask(col):
+    """
+    Returns is_obfuscated for every value of a Series, as a boolean array.
+    Placeholders like '****' repeat a lot, so each distinct value is checked once.
+    """
+    codes, uniques = pd.factorize(col)
+    # Code -1 (missing value) picks the trailing True
+    per_value = np.array([is_obfuscated(val) for val in uniques] + [True], dtype=bool)
+    return per_value[codes]
 
 def drop_obfuscated_rows(df, key_cols=None):
     """
@@ -31,7 +43,7 @@ def drop_obfuscated_rows(df, key_cols=None):
     """
     if key_cols is None:
         key_cols = ['location', 'company']
-    mask = df[key_cols].apply(lambda col: col.map(is_obfuscated)).all(axis=1)
+    mask = df[key_cols].apply(obfuscated_mask).all(axis=1)
     dropped = mask.sum()
     print(f"Dropping {dropped} rows where all key columns are obfuscated out of {len(df)}")
     return df[~mask].copy()
@@ -43,7 +55,7 @@ def drop_rows_with_any_obfuscated(df, cols=None):
     """
     if cols is None:
         cols = df.columns
-    mask = df[cols].applymap(is_obfuscated).any(axis=1)
+    mask = df[cols].apply(obfuscated_mask).any(axis=1)
     dropped = mask.sum()
     print(f"Dropping {dropped} rows where any column is obfuscated out of {len(df)}")
     return df[~mask].copy()
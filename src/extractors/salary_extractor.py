@@ -21,78 +21,243 @@ import os
 import json
 import re
 import math
+import logging
+from functools import lru_cache
 from typing import List
 import pandas as pd
 from geopy.geocoders import Nominatim
 from countryinfo import CountryInfo
 
+# Pattern and match traces go to this logger at DEBUG level (off by default),
+# as extract_salaries runs for every job posting
+logger = logging.getLogger(__name__)
+
+# Currency symbols/names (lowercase) mapped to ISO codes, used to standardize currency_raw
+CURRENCY_MAP = {
+    '$': 'USD', 'usd': 'USD', 'us$': 'USD', 's$': 'SGD', '£': 'GBP', 'gbp': 'GBP', '€': 'EUR', 'eur': 'EUR',
+    'rs': 'INR', '₹': 'INR', 'inr': 'INR',
+    'rm': 'MYR', 'myr': 'MYR',
+    'sgd': 'SGD',
+    'idr': 'IDR', 'rp': 'IDR',
+    'thb': 'THB', '฿': 'THB',
+    'php': 'PHP', '₱': 'PHP',
+    'vnd': 'VND', '₫': 'VND',
+    'r': 'ZAR', 'zar': 'ZAR',
+    'top': 'TOP',
+    # Robust MXN mapping
+    'mx$': 'MXN', 'mxn': 'MXN', 'mx': 'MXN', 'mx pesos': 'MXN', 'mexican peso': 'MXN', 'mexican pesos': 'MXN',
+    # Add more variants for robustness
+    'k': None, 'm': None, '': None, None: None
+}
+ISO_CODES = {'USD','MYR','SGD','EUR','GBP','INR','THB','IDR','PHP','VND','ZAR','TOP','MXN'}
+
+# Currency symbols/codes (uppercase) matched by SalaryExtractor, mapped to ISO codes
+CURRENCY_SYMBOL_MAP = {
+    'MX$': 'MXN', 'MXN': 'MXN', '$': 'USD', 'USD': 'USD', 'US$': 'USD',
+    '€': 'EUR', 'EUR': 'EUR', '£': 'GBP', 'GBP': 'GBP', '¥': 'JPY', 'JPY': 'JPY',
+    'C$': 'CAD', 'CAD': 'CAD', 'A$': 'AUD', 'AUD': 'AUD',
+    'MYR': 'MYR', 'RM': 'MYR', 'SGD': 'SGD', 'S$': 'SGD',
+    'IDR': 'IDR', 'RP': 'IDR', '₱': 'PHP', 'PHP': 'PHP',
+    'VND': 'VND', '₫': 'VND', 'INR': 'INR', '₹': 'INR',
+    'CNY': 'CNY', 'RMB': 'CNY', 'KRW': 'KRW', '₩': 'KRW',
+    'BRL': 'BRL', 'R$': 'BRL', 'ZAR': 'ZAR', 'R': 'ZAR',
+    'THB': 'THB', '฿': 'THB', 'PLN': 'PLN', 'CZK': 'CZK', 'HUF': 'HUF',
+    'TRY': 'TRY', '₺': 'TRY', 'ILS': 'ILS', '₪': 'ILS',
+}
+
+# Sentence boundaries, and the keywords that make a sentence a salary candidate
+# (salary keywords present, funding/investment keywords absent)
+SENTENCE_SPLIT_PATTERN = re.compile(r'(?<=[.!?])\s+')
+SALARY_KEYWORDS = (
+    "salary", "compensation", "pay", "base pay", "base salary", "annual", "per year", "per annum",
+    "yearly", "monthly", "per month", "hourly", "per hour", "per week", "per day", "per diem",
+    "remuneration", "wage", "package", "rate", "earn", "income"
+)
+FUNDING_KEYWORDS = (
+    "funding", "raised", "investment", "series a", "series b", "series c", "venture", "capital",
+    "backed", "round", "financing", "investor", "acrew", "sequoia", "bain", "homebrew", "visa", "million", "billion"
+)
+
+# A salary number: digits with separators, then an optional K (thousand) or M (million) suffix
+NUMBER_PARTS_PATTERN = re.compile(r'([\d.,]*)([kKmM]?)')
+NUMBER_SUFFIX_MULTIPLIERS = {'': 1, 'k': 1_000, 'K': 1_000, 'm': 1_000_000, 'M': 1_000_000}
+
+# Every salary pattern contains a number, so text without a digit cannot match any of them
+DIGIT_PATTERN = re.compile(r'\d')
+
+@lru_cache(maxsize=None)
+def _period_multiplier(period):
+    """Returns the factor that converts a salary for the given period to an annual one."""
+    if period:
+        pl = period.lower()
+        if any(term in pl for term in ['month', 'monthly', 'per month', 'p.m.', 'pm']):
+            return 12
+        elif any(term in pl for term in ['hour', 'hourly', 'per hour', 'p.h.', 'ph']):
+            return 40 * 52
+        elif any(term in pl for term in ['week', 'weekly', 'per week', 'p.w.', 'pw']):
+            return 52
+        elif any(term in pl for term in ['day', 'daily', 'per day']):
+            return 260
+    return 1  # Default to annual
+
+@lru_cache(maxsize=None)
+def standardize_currency(val):
+    """Maps a raw currency string (symbol, code or name) to its ISO code, or None."""
+    if not val or str(val).strip() == '' or str(val).lower() == 'none':
+        return None
+    v = str(val).strip().lower()
+    v = v.rstrip('.,')
+    # Direct match
+    if v in CURRENCY_MAP and CURRENCY_MAP[v]:
+        return CURRENCY_MAP[v]
+    # Handle common MXN/MX$ patterns
+    if v.startswith('mx$') or v.startswith('mxn') or v.startswith('mx '):
+        return 'MXN'
+    if 'mexican peso' in v or 'mexican pesos' in v:
+        return 'MXN'
+    # Try to match with spaces removed
+    v_nospace = v.replace(' ', '')
+    if v_nospace in CURRENCY_MAP and CURRENCY_MAP[v_nospace]:
+        return CURRENCY_MAP[v_nospace]
+    # ISO code direct
+    if v.upper() in ISO_CODES:
+        return v.upper()
+    # Try first character (for symbols)
+    if v and v[0] in CURRENCY_MAP and CURRENCY_MAP[v[0]]:
+        return CURRENCY_MAP[v[0]]
+    return None
+
+@lru_cache(maxsize=None)
+def normalize_currency(currency):
+    """Maps a matched currency symbol or code to its ISO code (else the cleaned code)."""
+    if not currency:
+        return None
+    c = currency.upper().replace(' ', '')
+    # Try to match the mapping, else return the cleaned code
+    return CURRENCY_SYMBOL_MAP.get(c, c)
+
+@lru_cache(maxsize=100_000)
+def normalize_number(number_str: str) -> float:
+    """Convert number string to float value, handling K/M suffix and decimals correctly."""
+    if not number_str:
+        return 0.0
+
+    # One match splits the digits from the K/M multiplier suffix
+    match = NUMBER_PARTS_PATTERN.fullmatch(number_str.strip())
+    if not match:
+        return 0.0
+    digits, suffix = match.groups()
+
+    # Commas are thousands separators. Several periods are too (European
+    # thousands, e.g. "4.500.000"); a single period is the decimal point
+    digits = digits.replace(',', '')
+    if digits.count('.') > 1:
+        digits = digits.replace('.', '')
+
+    try:
+        return float(digits) * NUMBER_SUFFIX_MULTIPLIERS[suffix]
+    except ValueError:
+        return 0.0
+
+def _trie_pattern(words):
+    """
+    Builds a regex matching the same strings as the longest-first alternation
+    of words, nested as a trie (e.g. 'R(?:M(?:B)?|[S$P])?'). At any position the
+    regex engine then follows one branch per character instead of trying every
+    word in turn, and still prefers the longest word that matches.
+    """
+    trie = {}
+    for word in words:
+        node = trie
+        for ch in word:
+            node = node.setdefault(ch, {})
+        node[''] = None  # end of a word
+
+    def build(node):
+        # Characters that end a word and have no continuation share one class
+        leaves = [re.escape(ch) for ch, child in node.items() if ch and child == {'': None}]
+        branches = [re.escape(ch) + build(child) for ch, child in node.items() if ch and child != {'': None}]
+        if leaves:
+            branches.append(leaves[0] if len(leaves) == 1 else '[' + ''.join(leaves) + ']')
+        if '' in node:
+            # A word ends here: longer continuations are tried first
+            return '(?:' + '|'.join(branches) + ')?' if branches else ''
+        return branches[0] if len(branches) == 1 else '(?:' + '|'.join(branches) + ')'
+
+    return build(trie)
+
 class SalaryExtractor:
     """
     Extractor for salary information from job postings.
     This class uses regular expressions to identify and extract salary details.
     """
-    def __init__(self):
-        # Major currency symbols and codes
-        self.currency_symbols = {
-            'MX$',
-            # Symbols
-            '$', '£', '€', '¥', '₹', '₽', '₩', '₪', '₦', '₡', '₴', '₨', '₵', '₫', '₮', '₯', '₰', '₱', '₲', '₳', '₴', '₵', '₶', '₷', '₸', '₹', '₺', '₻', '₼', '₽', '₾', '₿', '＄', '￠', '￡', '￢', '￣', '￤', '￥', '￦',
-            # Major currency codes with variations
-            'USD', 'EUR', 'GBP', 'JPY', 'CNY', 'INR', 'CAD', 'AUD', 'CHF', 'SEK', 'NOK', 'DKK', 'RUB', 'KRW', 'SGD', 'HKD', 'NZD', 'MXN', 'BRL', 'ZAR', 'THB', 'MYR', 'IDR', 'PHP', 'VND', 'TWD', 'PLN', 'CZK', 'HUF', 'TRY', 'ILS', 'AED', 'SAR', 'EGP', 'QAR', 'KWD', 'BHD', 'OMR', 'JOD', 'LBP', 'PKR', 'LKR', 'BDT', 'NPR', 'AFN', 'MMK', 'LAK', 'KHR', 'BND', 'FJD', 'PGK', 'SBD', 'TOP', 'VUV', 'WST',
-            # Regional names and abbreviations
-            'RM', 'MYR', 'RINGGIT', 'MALAYSIAN RINGGIT',
-            'SGD', 'SINGAPORE DOLLAR', 'S$',
-            'RUPIAH', 'IDR', 'RP',
-            'BAHT', 'THB', '฿',
-            'PESO', 'PESOS', 'PHP', '₱',
-            'DONG', 'VND', '₫',
-            'RUPEE', 'RUPEES', 'INR', 'RS', '₹',
-            'YUAN', 'RENMINBI', 'CNY', 'RMB', '¥',
-            'WON', 'KRW', '₩',
-            'DIRHAM', 'AED', 'DH',
-            'RIYAL', 'SAR', 'SR',
-            'SHEKEL', 'ILS', '₪',
-            'LIRA', 'TRY', '₺',
-            'RUBLE', 'ROUBLE', 'RUB', '₽',
-            'RAND', 'ZAR', 'R',
-            'REAL', 'BRL', 'R$',
-            'KRONA', 'KRONOR', 'SEK', 'KR',
-            'KRONE', 'KRONER', 'NOK', 'DKK',
-            'FRANC', 'CHF', 'FR',
-            'ZLOTY', 'PLN', 'ZŁ',
-            'FORINT', 'HUF', 'FT',
-            'KORUNA', 'CZK', 'KČ',
-            'DINAR', 'KWD', 'BHD', 'JOD', 'DZD', 'IQD', 'LYD', 'TND',
-            'NAIRA', 'NGN', '₦',
-            'CEDI', 'GHS', '₵',
-            'BIRR', 'ETB',
-            'SHILLING', 'KES', 'UGX', 'TZS',
-            'AFGHANI', 'AFN', '؋',
-            'TAKA', 'BDT', '৳',
-            'KYAT', 'MMK', 'K',
-            'KIP', 'LAK', '₭',
-            'RIEL', 'KHR', '៛',
-        }
-
-        # Common salary period indicators
-        self.period_indicators = [
-            'per year', 'annually', 'yearly', 'per annum', 'p.a.', 'pa',
-            'per month', 'monthly', 'per mth', 'p.m.', 'pm',
-            'per hour', 'hourly', 'per hr', 'p.h.', 'ph',
-            'per week', 'weekly', 'per wk', 'p.w.', 'pw',
-            'per day', 'daily', 'per diem'
-        ]
+    # Major currency symbols and codes
+    currency_symbols = frozenset({
+        'MX$',
+        # Symbols
+        '$', '£', '€', '¥', '₹', '₽', '₩', '₪', '₦', '₡', '₴', '₨', '₵', '₫', '₮', '₯', '₰', '₱', '₲', '₳', '₴', '₵', '₶', '₷', '₸', '₹', '₺', '₻', '₼', '₽', '₾', '₿', '＄', '￠', '￡', '￢', '￣', '￤', '￥', '￦',
+        # Major currency codes with variations
+        'USD', 'EUR', 'GBP', 'JPY', 'CNY', 'INR', 'CAD', 'AUD', 'CHF', 'SEK', 'NOK', 'DKK', 'RUB', 'KRW', 'SGD', 'HKD', 'NZD', 'MXN', 'BRL', 'ZAR', 'THB', 'MYR', 'IDR', 'PHP', 'VND', 'TWD', 'PLN', 'CZK', 'HUF', 'TRY', 'ILS', 'AED', 'SAR', 'EGP', 'QAR', 'KWD', 'BHD', 'OMR', 'JOD', 'LBP', 'PKR', 'LKR', 'BDT', 'NPR', 'AFN', 'MMK', 'LAK', 'KHR', 'BND', 'FJD', 'PGK', 'SBD', 'TOP', 'VUV', 'WST',
+        # Regional names and abbreviations
+        'RM', 'MYR', 'RINGGIT', 'MALAYSIAN RINGGIT',
+        'SGD', 'SINGAPORE DOLLAR', 'S$',
+        'RUPIAH', 'IDR', 'RP',
+        'BAHT', 'THB', '฿',
+        'PESO', 'PESOS', 'PHP', '₱',
+        'DONG', 'VND', '₫',
+        'RUPEE', 'RUPEES', 'INR', 'RS', '₹',
+        'YUAN', 'RENMINBI', 'CNY', 'RMB', '¥',
+        'WON', 'KRW', '₩',
+        'DIRHAM', 'AED', 'DH',
+        'RIYAL', 'SAR', 'SR',
+        'SHEKEL', 'ILS', '₪',
+        'LIRA', 'TRY', '₺',
+        'RUBLE', 'ROUBLE', 'RUB', '₽',
+        'RAND', 'ZAR', 'R',
+        'REAL', 'BRL', 'R$',
+        'KRONA', 'KRONOR', 'SEK', 'KR',
+        'KRONE', 'KRONER', 'NOK', 'DKK',
+        'FRANC', 'CHF', 'FR',
+        'ZLOTY', 'PLN', 'ZŁ',
+        'FORINT', 'HUF', 'FT',
+        'KORUNA', 'CZK', 'KČ',
+        'DINAR', 'KWD', 'BHD', 'JOD', 'DZD', 'IQD', 'LYD', 'TND',
+        'NAIRA', 'NGN', '₦',
+        'CEDI', 'GHS', '₵',
+        'BIRR', 'ETB',
+        'SHILLING', 'KES', 'UGX', 'TZS',
+        'AFGHANI', 'AFN', '؋',
+        'TAKA', 'BDT', '৳',
+        'KYAT', 'MMK', 'K',
+        'KIP', 'LAK', '₭',
+        'RIEL', 'KHR', '៛',
+    })
 
-        # Build the comprehensive regex pattern
-        self._build_pattern()
+    # Common salary period indicators
+    period_indicators = (
+        'per year', 'annually', 'yearly', 'per annum', 'p.a.', 'pa',
+        'per month', 'monthly', 'per mth', 'p.m.', 'pm',
+        'per hour', 'hourly', 'per hr', 'p.h.', 'ph',
+        'per week', 'weekly', 'per wk', 'p.w.', 'pw',
+        'per day', 'daily', 'per diem'
+    )
 
-    def _build_pattern(self):
-        # Create currency pattern (case-insensitive)
-        currency_list = sorted(list(self.currency_symbols), key=len, reverse=True)
-        currency_pattern = '|'.join(re.escape(curr) for curr in currency_list)
+    def __init__(self):
+        # Build the comprehensive regex pattern. It only depends on the class-level
+        # symbol tables, so it is built and compiled once per class and shared by
+        # every instance
+        cls = type(self)
+        if 'compiled_patterns' not in cls.__dict__:
+            cls._build_pattern()
+
+    @classmethod
+    def _build_pattern(cls):
+        # Create currency pattern (case-insensitive), as a trie so that the many
+        # currency alternatives in every pattern are not tried one by one
+        currency_pattern = _trie_pattern(cls.currency_symbols)
 
         # Period indicators pattern
-        period_pattern = '|'.join(re.escape(period) for period in self.period_indicators)
+        period_pattern = '|'.join(re.escape(period) for period in cls.period_indicators)
 
         # Number patterns for different formats
         # Improved: match full numbers with thousands separators, e.g. 235,200 or 252,806
@@ -106,7 +271,7 @@ class SalaryExtractor:
         range_pattern = rf'{currency_prefix}?({number_pattern})(?:/yr|/year|/annum|/mo|/month|/hr|/hour)?\s*[-–—to]+\s*{currency_prefix}?({number_pattern})(?:/yr|/year|/annum|/mo|/month|/hr|/hour)?(?:\s*({period_pattern}))?'
 
         # All patterns, with the new one first
-        self.patterns = [
+        cls.patterns = [
             range_pattern,
             # Pattern 1: Currency prefix required for both numbers (e.g., MX$235,200- MX$252,806)
             rf'{currency_prefix}({number_pattern})\s*[-–—to]+\s*{currency_prefix}({number_pattern})(?:\s*({period_pattern}))?',
@@ -124,13 +289,13 @@ class SalaryExtractor:
             rf'(?:salary|compensation|pay|wage|income)[:]\s*{currency_prefix}?({number_pattern})\s*[-–—to]\s*{currency_prefix}?({number_pattern})(?:\s*({period_pattern}))?',
         ]
 
-        # Debug: print the actual regex for Pattern 1 and the currency alternation
-        print("[DEBUG] Pattern 1 regex:", self.patterns[1])
-        print("[DEBUG] Pattern 1.5 regex:", self.patterns[2])
-        print("[DEBUG] Currency alternation:", currency_pattern)
+        # Debug: log the actual regex for Pattern 1 and the currency alternation
+        logger.debug("Pattern 1 regex: %s", cls.patterns[1])
+        logger.debug("Pattern 1.5 regex: %s", cls.patterns[2])
+        logger.debug("Currency alternation: %s", currency_pattern)
 
         # Compile all patterns (case-insensitive)
-        self.compiled_patterns = [re.compile(pattern, re.IGNORECASE) for pattern in self.patterns]
+        cls.compiled_patterns = [re.compile(pattern, re.IGNORECASE) for pattern in cls.patterns]
 
     def extract_salaries(self, text: str) -> List[dict]:
         """
@@ -138,32 +303,26 @@ class SalaryExtractor:
         Only considers sentences with salary-related keywords and ignores funding/investment contexts.
         Filters out implausible salary values (zero, negative, or below a minimum threshold).
         """
-        import re
         results = []
 
-        salary_keywords = [
-            "salary", "compensation", "pay", "base pay", "base salary", "annual", "per year", "per annum",
-            "yearly", "monthly", "per month", "hourly", "per hour", "per week", "per day", "per diem",
-            "remuneration", "wage", "package", "rate", "earn", "income"
-        ]
-        funding_keywords = [
-            "funding", "raised", "investment", "series a", "series b", "series c", "venture", "capital",
-            "backed", "round", "financing", "investor", "acrew", "sequoia", "bain", "homebrew", "visa", "million", "billion"
-        ]
-
         # Minimum plausible salary (annualized, in any currency, before conversion)
         MIN_REASONABLE_SALARY = 5000  # e.g., $5,000/year or equivalent
 
         # Split text into sentences (more granular than lines/paragraphs)
-        sentences = re.split(r'(?<=[.!?])\s+', text)
-        candidate_sentences = [
-            sent for sent in sentences
-            if any(kw in sent.lower() for kw in salary_keywords)
-            and not any(fk in sent.lower() for fk in funding_keywords)
-        ]
+        sentences = SENTENCE_SPLIT_PATTERN.split(text)
+        candidate_sentences = []
+        for sent in sentences:
+            # Lowercase each sentence once for all keyword checks
+            sent_lower = sent.lower()
+            if (any(kw in sent_lower for kw in SALARY_KEYWORDS)
+                    and not any(fk in sent_lower for fk in FUNDING_KEYWORDS)):
+                candidate_sentences.append(sent)
         # If no candidate sentences, fallback to all sentences
         if not candidate_sentences:
             candidate_sentences = sentences
+        # Sentences without a digit cannot match any pattern: skip them up front
+        # instead of scanning them once per pattern
+        candidate_sentences = [sent for sent in candidate_sentences if DIGIT_PATTERN.search(sent)]
 
         for i, pattern in enumerate(self.compiled_patterns):
             for sent in candidate_sentences:
@@ -231,17 +390,19 @@ class SalaryExtractor:
 
                     # Only add if at least one salary is present
                     if min_salary is not None or max_salary is not None or single_salary is not None:
-                        debug_info = {
-                            'pattern': i,
-                            'sentence': sent,
-                            'groups': groups,
-                            'currency': currency,
-                            'min_salary': min_salary,
-                            'max_salary': max_salary,
-                            'single_salary': single_salary,
-                            'period': period
-                        }
-                        print('[DEBUG][extract_salaries]', debug_info)
+                        # Only build the trace when DEBUG logging is on
+                        if logger.isEnabledFor(logging.DEBUG):
+                            debug_info = {
+                                'pattern': i,
+                                'sentence': sent,
+                                'groups': groups,
+                                'currency': currency,
+                                'min_salary': min_salary,
+                                'max_salary': max_salary,
+                                'single_salary': single_salary,
+                                'period': period
+                            }
+                            logger.debug("extract_salaries: %s", debug_info)
                         results.append({
                             'currency': currency,
                             'min_salary': min_salary,
@@ -254,25 +415,7 @@ class SalaryExtractor:
         # Always return a list, even if empty
         return self._deduplicate_results(results)
     def _normalize_currency(self, currency):
-        if not currency:
-            return None
-        c = currency.upper().replace(' ', '')
-        # Map common currency symbols/codes to ISO codes
-        mapping = {
-            'MX$': 'MXN', 'MXN': 'MXN', '$': 'USD', 'USD': 'USD', 'US$': 'USD',
-            '€': 'EUR', 'EUR': 'EUR', '£': 'GBP', 'GBP': 'GBP', '¥': 'JPY', 'JPY': 'JPY',
-            'C$': 'CAD', 'CAD': 'CAD', 'A$': 'AUD', 'AUD': 'AUD',
-            'MYR': 'MYR', 'RM': 'MYR', 'SGD': 'SGD', 'S$': 'SGD',
-            'IDR': 'IDR', 'RP': 'IDR', '₱': 'PHP', 'PHP': 'PHP',
-            'VND': 'VND', '₫': 'VND', 'INR': 'INR', '₹': 'INR',
-            'CNY': 'CNY', 'RMB': 'CNY', 'KRW': 'KRW', '₩': 'KRW',
-            'BRL': 'BRL', 'R$': 'BRL', 'ZAR': 'ZAR', 'R': 'ZAR',
-            'THB': 'THB', '฿': 'THB', 'PLN': 'PLN', 'CZK': 'CZK', 'HUF': 'HUF',
-            'TRY': 'TRY', '₺': 'TRY', 'ILS': 'ILS', '₪': 'ILS',
-        }
-        # Try to match the mapping, else return the cleaned code
-        return mapping.get(c, c)
-
+        return normalize_currency(currency)
 
     def _is_number(self, text: str) -> bool:
         """Check if text represents a salary number"""
@@ -284,51 +427,8 @@ class SalaryExtractor:
 
     def _normalize_number(self, number_str: str) -> float:
         """Convert number string to float value, handling K/M suffix and decimals correctly."""
-        if not number_str:
-            return 0.0
-    
-        original_str = number_str.strip()
-    
-        # Handle M/m multiplier (million)
-        if original_str.lower().endswith('m'):
-            multiplier = 1_000_000
-            number_str = re.sub(r'[mM]$', '', number_str)
-        # Handle K/k multiplier (thousand)
-        elif original_str.lower().endswith('k'):
-            multiplier = 1_000
-            number_str = re.sub(r'[kK]$', '', number_str)
-        else:
-            multiplier = 1
-    
-        # Remove commas and spaces, but keep decimal point
-        number_str = re.sub(r'[,\s]', '', number_str)
-    
-        # Handle European vs US number formatting
-        # European: 50.000,50  (period=thousands, comma=decimal)
-        # US: 50,000.50      (comma=thousands, period=decimal)
-        if ',' in number_str and '.' in number_str:
-            last_comma = number_str.rfind(',')
-            last_period = number_str.rfind('.')
-            if last_period > last_comma:
-                # US format: remove commas
-                number_str = number_str.replace(',', '')
-            else:
-                # European format: remove periods and replace comma with period
-                number_str = number_str.replace('.', '').replace(',', '.')
-        else:
-            # Only one separator type
-            if '.' in number_str and ',' not in number_str:
-                # Might be European thousands, e.g. "4.500.000"
-                if number_str.count('.') > 1:
-                    number_str = number_str.replace('.', '')
-                # else single period likely decimal, keep it
-            # Remove commas and spaces (already done above)
-    
-        try:
-            return float(number_str) * multiplier
-        except ValueError:
-            return 0.0
-        
+        return normalize_number(number_str)
+
     def _deduplicate_results(self, results: List[dict]) -> List[dict]:
         """Remove duplicate and overlapping salary extractions"""
         if not results:
@@ -413,37 +513,23 @@ class SalaryETL:
             'single_salary_raw', 'salary_period', 'min_salary_annual_usd',
             'max_salary_annual_usd', 'avg_salary_annual_usd', 'salary_confidence'
         ]
-        for col in salary_columns:
-            df[col] = None
 
         exchange_rates = self.get_exchange_rates_to_usd()
         MAX_REASONABLE_SALARY = 1_000_000  # adjust as needed
 
-        # --- Add MXN to currency_map and iso_codes ---
-        currency_map = {
-            '$': 'USD', 'usd': 'USD', 'us$': 'USD', 's$': 'SGD', '£': 'GBP', 'gbp': 'GBP', '€': 'EUR', 'eur': 'EUR',
-            'rs': 'INR', '₹': 'INR', 'inr': 'INR',
-            'rm': 'MYR', 'myr': 'MYR',
-            'sgd': 'SGD',
-            'idr': 'IDR', 'rp': 'IDR',
-            'thb': 'THB', '฿': 'THB',
-            'php': 'PHP', '₱': 'PHP',
-            'vnd': 'VND', '₫': 'VND',
-            'r': 'ZAR', 'zar': 'ZAR',
-            'top': 'TOP',
-            # Robust MXN mapping
-            'mx$': 'MXN', 'mxn': 'MXN', 'mx': 'MXN', 'mx pesos': 'MXN', 'mexican peso': 'MXN', 'mexican pesos': 'MXN',
-            # Add more variants for robustness
-            'k': None, 'm': None, '': None, None: None
-        }
-        iso_codes = {'USD','MYR','SGD','EUR','GBP','INR','THB','IDR','PHP','VND','ZAR','TOP','MXN'}
-
         # Track which rows have a valid extracted salary+currency
         extracted_currency_mask = []
 
-        for idx, row in df.iterrows():
+        # Row values are read from the column arrays, and each row's salary
+        # columns are collected as one record, so that no per-cell df.loc
+        # writes are needed
+        headers = df['header_text'] if 'header_text' in df.columns else [None] * len(df)
+        texts = df[text_column]
+        titles = df[title_column] if include_title and title_column in df.columns else [None] * len(df)
+        records = []
+
+        for header_text, text, title in zip(headers, texts, titles):
             # Try header_text first if available
-            header_text = row.get('header_text', None)
             header_salary_results = []
             if header_text and isinstance(header_text, str) and header_text.strip():
                 header_salary_results = self.extractor.extract_salaries(header_text)
@@ -464,10 +550,10 @@ class SalaryETL:
             else:
                 # Fallback to title+description logic
                 text_to_search = ''
-                if pd.notna(row.get(text_column, '')):
-                    text_to_search = row[text_column]
-                if include_title and title_column in df.columns and pd.notna(row.get(title_column, '')):
-                    text_to_search = f"{row[title_column]} {text_to_search}"
+                if pd.notna(text):
+                    text_to_search = text
+                if include_title and title_column in df.columns and pd.notna(title):
+                    text_to_search = f"{title} {text_to_search}"
 
                 salary_results = self.extractor.extract_salaries(text_to_search)
                 filtered_results = []
@@ -487,66 +573,39 @@ class SalaryETL:
             if best_result:
                 currency_from_salary = best_result.get('currency')
                 if currency_from_salary and currency_from_salary.strip():
-                    df.loc[idx, 'currency_raw'] = currency_from_salary.strip().lower()
+                    currency_raw = currency_from_salary.strip().lower()
                 else:
-                    df.loc[idx, 'currency_raw'] = None  # will be inferred later if needed
+                    currency_raw = None  # will be inferred later if needed
 
                 for k in ['min_salary', 'max_salary', 'single_salary']:
                     v = best_result.get(k)
                     if v is not None and v > MAX_REASONABLE_SALARY:
                         best_result[k] = None
-                df.loc[idx, 'has_salary'] = True
-                df.loc[idx, 'min_salary_raw'] = best_result['min_salary']
-                df.loc[idx, 'max_salary_raw'] = best_result['max_salary']
-                df.loc[idx, 'single_salary_raw'] = best_result['single_salary']
-                df.loc[idx, 'salary_period'] = best_result['period']
-
-                min_usd, max_usd, avg_usd = self._convert_to_annual_usd(best_result, exchange_rates)
-                for col, val in zip(['min_salary_annual_usd', 'max_salary_annual_usd', 'avg_salary_annual_usd'],
-                                   [min_usd, max_usd, avg_usd]):
-                    if val is not None and val > MAX_REASONABLE_SALARY:
-                        df.loc[idx, col] = None
-                    else:
-                        df.loc[idx, col] = val
 
-                df.loc[idx, 'salary_confidence'] = self._calculate_confidence(best_result)
+                annual_usd = [
+                    None if val is not None and val > MAX_REASONABLE_SALARY else val
+                    for val in self._convert_to_annual_usd(best_result, exchange_rates)
+                ]
+
+                records.append((
+                    True, currency_raw, best_result['min_salary'], best_result['max_salary'],
+                    best_result['single_salary'], best_result['period'], *annual_usd,
+                    self._calculate_confidence(best_result)
+                ))
                 # Mark this row as having an extracted salary+currency
                 extracted_currency_mask.append(True)
             else:
-                df.loc[idx, 'has_salary'] = False
-                for col in ['currency_raw', 'min_salary_raw', 'max_salary_raw', 'single_salary_raw',
-                            'salary_period', 'min_salary_annual_usd', 'max_salary_annual_usd',
-                            'avg_salary_annual_usd', 'salary_confidence']:
-                    df.loc[idx, col] = None
+                records.append((False,) + (None,) * (len(salary_columns) - 1))
                 extracted_currency_mask.append(False)
 
-        # --- Standardize all currency values to ISO codes ---
-        def standardize_currency(val):
-            if not val or str(val).strip() == '' or str(val).lower() == 'none':
-                return None
-            v = str(val).strip().lower()
-            v = v.rstrip('.,')
-            # Direct match
-            if v in currency_map and currency_map[v]:
-                return currency_map[v]
-            # Handle common MXN/MX$ patterns
-            if v.startswith('mx$') or v.startswith('mxn') or v.startswith('mx '):
-                return 'MXN'
-            if 'mexican peso' in v or 'mexican pesos' in v:
-                return 'MXN'
-            # Try to match with spaces removed
-            v_nospace = v.replace(' ', '')
-            if v_nospace in currency_map and currency_map[v_nospace]:
-                return currency_map[v_nospace]
-            # ISO code direct
-            if v.upper() in iso_codes:
-                return v.upper()
-            # Try first character (for symbols)
-            if v and v[0] in currency_map and currency_map[v[0]]:
-                return currency_map[v[0]]
-            return None
+        # One object column per salary field, in salary_columns order
+        columns = list(zip(*records)) or [()] * len(salary_columns)
+        for col, values in zip(salary_columns, columns):
+            df[col] = pd.Series(values, index=df.index, dtype=object)
 
-        df['currency_raw'] = df['currency_raw'].apply(standardize_currency)
+        # --- Standardize all currency values to ISO codes ---
+        # (currency_raw has few distinct values, and standardize_currency is memoized)
+        df['currency_raw'] = df['currency_raw'].map(standardize_currency)
         df['currency_raw'] = df['currency_raw'].fillna('USD')
 
         # --- Fallback: Use geocoding and countryinfo for any remaining missing currency_raw values ---
@@ -640,18 +699,7 @@ class SalaryETL:
         if exchange_rates is None:
             exchange_rates = self.get_exchange_rates_to_usd()
         exchange_rate = exchange_rates.get(currency, 1.0)
-        period_multiplier = 1  # Default to annual
-
-        if period:
-            pl = period.lower()
-            if any(term in pl for term in ['month', 'monthly', 'per month', 'p.m.', 'pm']):
-                period_multiplier = 12
-            elif any(term in pl for term in ['hour', 'hourly', 'per hour', 'p.h.', 'ph']):
-                period_multiplier = 40 * 52
-            elif any(term in pl for term in ['week', 'weekly', 'per week', 'p.w.', 'pw']):
-                period_multiplier = 52
-            elif any(term in pl for term in ['day', 'daily', 'per day']):
-                period_multiplier = 260
+        period_multiplier = _period_multiplier(period)
 
         min_annual_usd = None
         max_annual_usd = None
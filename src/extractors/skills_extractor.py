@@ -60,6 +60,20 @@ def normalize_skill(skill):
     # Add more mappings as needed
     return skill.strip()
 
+def _compile_keywords(keywords):
+    """
+    Returns (keyword, word-boundary pattern, normalized skill name) triples.
+    """
+    return [(kw, re.compile(r'\b' + re.escape(kw) + r'\b'), normalize_skill(kw)) for kw in keywords]
+
+# Patterns compiled once at import, instead of being rebuilt for every description
+SKILL_PATTERNS = {
+    "programming_languages": _compile_keywords(KEYWORDS_PROGRAMMING),
+    "libraries": _compile_keywords(KEYWORDS_LIBRARIES),
+    "analyst_tools": _compile_keywords(KEYWORDS_ANALYST_TOOLS),
+    "cloud_platforms": _compile_keywords(KEYWORDS_CLOUD_TOOLS),
+}
+
 def extract_skills(text):
     """
     Extract skills by category from a job description.
@@ -71,23 +85,12 @@ def extract_skills(text):
         dict: A dictionary with extracted skills under each category.
     """
     if not isinstance(text, str):
-        return {
-            "programming_languages": [],
-            "libraries": [],
-            "analyst_tools": [],
-            "cloud_platforms": []
-        }
+        return {category: [] for category in SKILL_PATTERNS}
 
     text = text.lower()
-
-    def extract_from_list(keywords):
-        found = [kw for kw in keywords if re.search(r'\b' + re.escape(kw) + r'\b', text)]
-        # Normalize all found skills
-        return sorted(set([normalize_skill(kw) for kw in found]))
-
+    # Normalized names of all keywords found, per category. The plain substring
+    # test is a cheap filter; the regex then checks the word boundaries.
     return {
-        "programming_languages": extract_from_list(KEYWORDS_PROGRAMMING),
-        "libraries": extract_from_list(KEYWORDS_LIBRARIES),
-        "analyst_tools": extract_from_list(KEYWORDS_ANALYST_TOOLS),
-        "cloud_platforms": extract_from_list(KEYWORDS_CLOUD_TOOLS),
+        category: sorted({skill for kw, pattern, skill in patterns if kw in text and pattern.search(text)})
+        for category, patterns in SKILL_PATTERNS.items()
     }
@@ -1,7 +1,7 @@
 """
 File: src/gold_etl_temp.py 
 ---------------------------
-Manual script to generate gold-layer Parquet outputs from data/silver/enriched_jobs.csv.
+Manual script to generate gold-layer Parquet outputs from data/silver/enriched_jobs.parquet.
 This script mirrors the gold-layer logic in etl.py but is standalone for quick batch processing.
 Outputs are saved to data/gold/.
 Use only if the gold-layer logic has changed or needs to be re-applied.
@@ -13,7 +13,7 @@ For a complete ETL workflow, follow these steps:
    ```bash
    python src/gold_etl_temp.py
    ```
-   - This reads our enriched_jobs.csv data, and produces the gold-layer Parquet files in gold.
+   - This reads our enriched_jobs.parquet data, and produces the gold-layer Parquet files in gold.
 
 2. Load/append the gold-layer Parquet files to MotherDuck:
    ```bash
@@ -260,7 +260,7 @@ def main():
 
     The following steps are executed:
 
-    1. Load the enriched jobs dataset from data/silver/enriched_jobs.csv
+    1. Load the enriched jobs dataset from data/silver/enriched_jobs.parquet
     2. Parse the skills columns for gold layer format
     3. Compute clusters based on binary skill features
     4. Build the following gold layer tables:
@@ -275,10 +275,10 @@ def main():
 
     5. Save the gold layer tables to data/gold/ as Parquet files
     """
-    enriched_path = Path('data/silver/enriched_jobs.csv')
+    enriched_path = Path('data/silver/enriched_jobs.parquet')
     gold_dir = Path('data/gold')
     skill_cols = ['programming_languages', 'libraries', 'analyst_tools', 'cloud_platforms']
-    df = pd.read_csv(enriched_path)
+    df = pd.read_parquet(enriched_path)
     df = parse_skills_for_gold(df, skill_cols)
     df, _ = compute_clusters(df, skill_cols)
     build_gold_tables(df, skill_cols, gold_dir)
@@ -1,84 +1,128 @@
 """
 File: src/rerun_salary_extraction.py
 ---------------------------------------------
-This script reruns the salary extraction process on the enriched_jobs.csv file.
+This script reruns the salary extraction process on the enriched_jobs.parquet file.
 It prioritizes the header_text for salary extraction, falling back to the description if necessary.
-Only run this script if needed to update salary information in the enriched_jobs.csv.
+Only run this script if needed to update salary information in the enriched_jobs.parquet.
 """
 
 # Import necessary libraries
+import os
+import re
 import sys
+from functools import lru_cache
 from pathlib import Path
 # Add project root to sys.path so 'src' can be imported
 sys.path.append(str(Path(__file__).resolve().parent.parent))
 import pandas as pd
+from joblib import Parallel, delayed
 from src.extractors.salary_extractor import SalaryETL
 
-# Load the cleaned enriched_jobs.csv
+# Path to the cleaned enriched_jobs.parquet
 project_root = Path(__file__).resolve().parent.parent
-csv_path = project_root / "data" / "silver" / "enriched_jobs.csv"
-df = pd.read_csv(csv_path)
+silver_path = project_root / "data" / "silver" / "enriched_jobs.parquet"
 
-etl = SalaryETL()
+# Number of row chunks the extraction is split into (spread over all cores)
+N_CHUNKS = 4 * (os.cpu_count() or 1)
+
+# Salary-related keywords: header_text containing any of them (anywhere, as
+# case-insensitive substrings) is used for extraction instead of the description
+HEADER_SALARY_KEYWORDS = [
+    "salary", "compensation", "pay", "base pay", "base salary", "annual", "per year", "per annum",
+    "yearly", "monthly", "per month", "hourly", "per hour", "per week", "per day", "per diem",
+    "remuneration", "wage", "package", "rate", "earn", "income"
+]
+HEADER_SALARY_KEYWORDS_PATTERN = re.compile("|".join(map(re.escape, HEADER_SALARY_KEYWORDS)), re.IGNORECASE)
+
+# Salary columns filled by extract_salary_fields, in this order
+SALARY_COLUMNS = [
+    'has_salary', 'currency_raw', 'min_salary_raw', 'max_salary_raw',
+    'single_salary_raw', 'salary_period', 'salary_confidence'
+]
+
+@lru_cache(maxsize=None)
+def get_salary_etl():
+    """
+    Returns the SalaryETL instance of the current process, created on first use
+    so each joblib worker builds its own instead of unpickling one per task.
+    """
+    return SalaryETL()
 
 # Custom logic: prioritize header_text, fallback to description
-def extract_salary_row(row):
+def extract_salary_fields(header_text, description):
     """
-    Given a row of a DataFrame, extracts salary information from the header_text if it contains
-    salary-related keywords; otherwise, falls back to the description. Returns a Series with the
-    extracted salary information, or None if no salary information was found.
+    Extracts salary information from the header_text if it contains salary-related
+    keywords; otherwise, falls back to the description. Returns a tuple with one
+    value per SALARY_COLUMNS entry (has_salary False and None values if no salary
+    information was found).
 
     Parameters
     ----------
-    row : pandas Series
-        A row of a DataFrame containing columns 'header_text' and 'description'.
+    header_text : str
+        The posting's header_text.
+    description : str
+        The posting's description.
     """
     # Try header_text first
-    header_text = str(row.get('header_text', '') or '')
-    description = str(row.get('description', '') or '')
+    header_text = str(header_text or '')
+    description = str(description or '')
     # If header_text contains salary-related keywords, use it; else use description
-    salary_keywords = [
-        "salary", "compensation", "pay", "base pay", "base salary", "annual", "per year", "per annum",
-        "yearly", "monthly", "per month", "hourly", "per hour", "per week", "per day", "per diem",
-        "remuneration", "wage", "package", "rate", "earn", "income"
-    ]
-    if any(kw in header_text.lower() for kw in salary_keywords):
+    # (one pattern search instead of one per keyword)
+    if HEADER_SALARY_KEYWORDS_PATTERN.search(header_text):
         text = header_text
     else:
         text = description
     # Extract salary info
+    etl = get_salary_etl()
     results = etl.extractor.extract_salaries(text)
     if results:
         best = etl._select_best_salary_result(results)
-        return pd.Series({
-            'has_salary': True,
-            'currency_raw': best.get('currency'),
-            'min_salary_raw': best.get('min_salary'),
-            'max_salary_raw': best.get('max_salary'),
-            'single_salary_raw': best.get('single_salary'),
-            'salary_period': best.get('period'),
-            'salary_confidence': etl._calculate_confidence(best)
-        })
+        return (
+            True,
+            best.get('currency'),
+            best.get('min_salary'),
+            best.get('max_salary'),
+            best.get('single_salary'),
+            best.get('period'),
+            etl._calculate_confidence(best)
+        )
     else:
-        return pd.Series({
-            'has_salary': False,
-            'currency_raw': None,
-            'min_salary_raw': None,
-            'max_salary_raw': None,
-            'single_salary_raw': None,
-            'salary_period': None,
-            'salary_confidence': None
-        })
+        return (False, None, None, None, None, None, None)
+
+def extract_salary_chunk(rows):
+    """Runs extract_salary_fields on a list of (header_text, description) pairs."""
+    return [extract_salary_fields(header_text, description) for header_text, description in rows]
+
+def main():
+    """
+    Reruns the salary extraction on enriched_jobs.parquet and overwrites it with
+    the new salary columns.
+    """
+    df = pd.read_parquet(silver_path)
+
+    # Extract in parallel worker processes, one chunk of rows per task, and
+    # collect the results column-wise
+    headers = df['header_text'] if 'header_text' in df.columns else [''] * len(df)
+    descriptions = df['description'] if 'description' in df.columns else [''] * len(df)
+    rows = list(zip(headers, descriptions))
+    chunk_size = max(1, -(-len(rows) // N_CHUNKS))
+    chunks = [rows[start:start + chunk_size] for start in range(0, len(rows), chunk_size)]
+    fields = [f for chunk in Parallel(n_jobs=-1)(delayed(extract_salary_chunk)(c) for c in chunks) for f in chunk]
+    salary_values = {col: [] for col in SALARY_COLUMNS}
+    for row_fields in fields:
+        for col, value in zip(SALARY_COLUMNS, row_fields):
+            salary_values[col].append(value)
+    salary_df = pd.DataFrame(salary_values, index=df.index)
 
-# Apply extraction row-wise
-salary_df = df.apply(extract_salary_row, axis=1)
+    # Merge results back into original DataFrame
+    for col in salary_df.columns:
+        df[col] = salary_df[col]
 
-# Merge results back into original DataFrame
-for col in salary_df.columns:
-    df[col] = salary_df[col]
+    # Optionally, recalculate annualized USD columns if needed
+    df = get_salary_etl().process_job_dataframe(df, text_column='description', include_title=True, title_column='title')
 
-# Optionally, recalculate annualized USD columns if needed
-df = etl.process_job_dataframe(df, text_column='description', include_title=True, title_column='title')
+    # Overwrite the original enriched_jobs.parquet with the new results
+    df.to_parquet(silver_path, index=False, compression='zstd')
 
-# Overwrite the original enriched_jobs.csv with the new results
-df.to_csv(csv_path, index=False)
\ No newline at end of file
+if __name__ == "__main__":
+    main()